@@ -2,7 +2,10 @@ from pathlib import Path
 
 import pytest
 
-from linkify_it import LinkifyIt
+from benchmark import corpus
+from linkify_it import LinkifyIt, main
+from linkify_it.main import PATTERN_CACHE, SourceCache
+from linkify_it.tlds import TLDS
 
 SAMPLES_PATH = Path(__file__).parent / "samples"
 
@@ -24,6 +27,28 @@ def test_init(benchmark, filename):
     benchmark(LinkifyIt)
 
 
+def test_init_uncached(benchmark):
+    def init():
+        PATTERN_CACHE.clear()
+        LinkifyIt().test("google.com")
+
+    benchmark(init)
+
+
+@pytest.mark.parametrize("source_cache", [False, True])
+def test_init_source_cache(benchmark, tmp_path, monkeypatch, source_cache):
+    """First scan in a new process, with sources built or loaded from disk."""
+    cache = SourceCache(str(tmp_path) if source_cache else None)
+    monkeypatch.setattr(main, "SOURCE_CACHE", cache)
+    LinkifyIt().test("google.com")
+
+    def init():
+        PATTERN_CACHE.clear()
+        LinkifyIt().test("google.com")
+
+    benchmark(init)
+
+
 @pytest.mark.parametrize(
     "filename", read_samples(SAMPLES_PATH), ids=get_ids(SAMPLES_PATH)
 )
@@ -58,3 +83,217 @@ def test_match(benchmark, filename):
     text = path.read_text()
 
     benchmark(linkify.match, text)
+
+
+@pytest.mark.parametrize("links", [100, 1000, 10000])
+def test_validate_schema(benchmark, links):
+    """Validate every schema hit of a document with ``links`` links.
+
+    Validation matches in place, so time should grow linearly with ``links``.
+    """
+    linkify = LinkifyIt()
+
+    text = "see http://example.com/path and " * links
+    positions = [
+        i + len("http:") for i in range(len(text)) if text.startswith("http:", i)
+    ]
+
+    def validate_all():
+        for pos in positions:
+            linkify.test_schema_at(text, "http:", pos)
+
+    benchmark(validate_all)
+
+
+@pytest.mark.parametrize("links", [100, 1000, 10000])
+def test_match_links(benchmark, links):
+    """Match a document with ``links`` schema, fuzzy and email links.
+
+    ``match()`` scans with one cursor, so time should grow linearly.
+    """
+    linkify = LinkifyIt()
+    linkify.match("warm up http://a.com b.com c@d.com")
+
+    text = "see http://example.com/path, example.org or foo@example.com. " * links
+
+    benchmark(linkify.match, text)
+
+
+def read_messages():
+    """Short messages: non-empty lines of all samples."""
+    messages = []
+    for filename in read_samples(SAMPLES_PATH):
+        lines = Path(filename).read_text().splitlines()
+        messages.extend(line for line in lines if line.strip())
+    return messages
+
+
+def test_match_loop(benchmark):
+    linkify = LinkifyIt()
+    messages = read_messages()
+    linkify.match_many(messages)
+
+    benchmark(lambda: [linkify.match(text) for text in messages])
+
+
+def test_match_many(benchmark):
+    linkify = LinkifyIt()
+    messages = read_messages()
+    linkify.match_many(messages)
+
+    benchmark(linkify.match_many, messages)
+
+
+@pytest.mark.parametrize("method", ["pretest", "test", "match"])
+def test_corpus(benchmark, method):
+    """Call ``method`` on each message of the corpus (see ``corpus.load()``)."""
+    linkify = LinkifyIt()
+    messages = corpus.load()
+    func = getattr(linkify, method)
+    linkify.match_many(messages)
+
+    benchmark(lambda: [func(text) for text in messages])
+
+
+def test_match_many_only_indexes(benchmark):
+    linkify = LinkifyIt()
+    messages = read_messages()
+    linkify.match_many(messages)
+
+    benchmark(linkify.match_many, messages, only_indexes=True)
+
+
+@pytest.mark.parametrize("workers", [1, 2, 4])
+def test_parallel_match(benchmark, workers):
+    """Throughput of ``parallel_match`` on sample lines, by number of workers."""
+    linkify = LinkifyIt()
+    messages = read_messages() * 20
+
+    benchmark.pedantic(
+        lambda: list(linkify.parallel_match(messages, workers=workers)),
+        rounds=3,
+    )
+
+
+def test_init_many_add(benchmark):
+    def init():
+        linkifyit = LinkifyIt()
+        for i in range(30):
+            linkifyit.add(f"app{i}:", "http:")
+        linkifyit.tlds(["onion", "i2p"], True)
+        linkifyit.test("app1://google.com")
+
+    benchmark(init)
+
+
+def _tlds_linkifier(mode):
+    if mode == "default":
+        return LinkifyIt()
+    if mode == "iana_flat":
+        # One regexp item, not merged into a trie
+        return LinkifyIt().tlds("|".join(TLDS))
+    if mode == "default_set":
+        return LinkifyIt(options={"tld_set": True})
+    if mode == "iana_set":
+        return LinkifyIt(options={"tld_set": True}).iana_tlds()
+    return LinkifyIt().iana_tlds()
+
+
+@pytest.mark.parametrize(
+    "mode", ["default", "iana_flat", "iana_trie", "default_set", "iana_set"]
+)
+def test_match_tlds(benchmark, mode):
+    """Match fuzzy links & emails with default tlds, and full IANA list joined
+    as flat alternation or merged into a trie. ``*_set`` modes check tlds with
+    a set lookup (``tld_set`` option).
+    """
+    linkify = _tlds_linkifier(mode)
+    text = (SAMPLES_PATH / "link_fuzzy.txt").read_text() + (
+        SAMPLES_PATH / "email_fuzzy.txt"
+    ).read_text()
+    linkify.match(text)
+
+    benchmark(linkify.match, text)
+
+
+@pytest.mark.parametrize("tld_set", [False, True])
+def test_tlds_update(benchmark, tld_set):
+    """Replace tlds list and scan, with and without ``tld_set`` option.
+
+    Pattern cache is cleared, so patterns depending on tlds are recompiled.
+    """
+    linkify = LinkifyIt(options={"tld_set": tld_set})
+    lists = [["com", "org"], ["net", "info"]]
+
+    def update():
+        for tlds in lists:
+            PATTERN_CACHE.clear()
+            linkify.tlds(tlds)
+            linkify.test("google.com")
+
+    update()
+    benchmark(update)
+
+
+def test_pretest_no_triggers(benchmark):
+    """Pretest short messages without ``.``, ``:``, ``@`` & ``/``, rejected by
+    prefilter before any regexp runs.
+    """
+    linkify = LinkifyIt()
+    messages = ["see you tomorrow, bring the charts and coffee"] * 1000
+
+    benchmark(lambda: [linkify.pretest(text) for text in messages])
+
+
+@pytest.mark.parametrize("scanner", ["regex", "anchor"])
+@pytest.mark.parametrize(
+    "filename", read_samples(SAMPLES_PATH), ids=get_ids(SAMPLES_PATH)
+)
+def test_match_scanner(benchmark, filename, scanner):
+    """Match samples with whole-text pattern search and anchor scanning."""
+    linkify = LinkifyIt(options={"scanner": scanner})
+    text = Path(filename).read_text()
+    linkify.match(text)
+
+    benchmark(linkify.match, text)
+
+
+@pytest.mark.parametrize("scanner", ["regex", "anchor"])
+def test_test_scanner_large(benchmark, scanner):
+    """Test a multi-MB document with few links near the end."""
+    linkify = LinkifyIt(options={"scanner": scanner})
+    text = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 50000
+    text += "see example.com"
+    linkify.test("warm up example.com")
+
+    benchmark(linkify.test, text)
+
+
+@pytest.mark.parametrize("variant", ["ascii", "unicode"])
+@pytest.mark.parametrize("filename", ["link_normal.txt", "many.txt"])
+def test_match_ascii(benchmark, filename, variant):
+    """Match ASCII samples with ASCII variants of patterns, and with full
+    Unicode patterns (forced by one non-ASCII char at the end).
+    """
+    linkify = LinkifyIt()
+    text = (SAMPLES_PATH / filename).read_text()
+    if variant == "unicode":
+        text += " é"
+    linkify.match(text)
+
+    benchmark(linkify.match, text)
+
+
+@pytest.mark.parametrize("engine", ["re", "regex"])
+@pytest.mark.parametrize(
+    "filename", read_samples(SAMPLES_PATH), ids=get_ids(SAMPLES_PATH)
+)
+def test_match_engine(benchmark, filename, engine):
+    """Match samples with patterns compiled by each regex engine."""
+    if engine != "re":
+        pytest.importorskip(engine)
+    linkify = LinkifyIt(options={"engine": engine})
+    text = Path(filename).read_text()
+    linkify.match(text)
+
+    benchmark(linkify.match, text)
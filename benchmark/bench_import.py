@@ -0,0 +1,99 @@
+"""Import time and first call latency, measured in fresh processes.
+
+Tests fail when the best run exceeds its budget. Budgets are in milliseconds,
+and can be changed with ``LINKIFY_IT_IMPORT_BUDGET_MS`` and
+``LINKIFY_IT_FIRST_CALL_BUDGET_MS`` environment variables.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parents[1]
+
+IMPORT_BUDGET_MS = float(os.environ.get("LINKIFY_IT_IMPORT_BUDGET_MS", 25))
+FIRST_CALL_BUDGET_MS = float(os.environ.get("LINKIFY_IT_FIRST_CALL_BUDGET_MS", 100))
+
+FIRST_CALL = """
+import time
+start = time.perf_counter()
+from linkify_it import LinkifyIt
+LinkifyIt().match("see example.com, http://example.org or foo@example.com")
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def run_python(env, *args):
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+@pytest.fixture(scope="module")
+def env(tmp_path_factory):
+    """Environment of measured processes: bytecode is cached (as in installed
+    packages), pattern sources are not.
+    """
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    env.pop("LINKIFY_IT_CACHE_DIR", None)
+    env["PYTHONPYCACHEPREFIX"] = str(tmp_path_factory.mktemp("pycache"))
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(ROOT), env.get("PYTHONPATH")])
+    )
+
+    # Write bytecode
+    run_python(env, "-c", FIRST_CALL)
+    return env
+
+
+def import_time_ms(env):
+    """Cumulative ``-X importtime`` of ``linkify_it`` package."""
+    stderr = run_python(env, "-X", "importtime", "-c", "import linkify_it").stderr
+    for line in stderr.splitlines():
+        if line.rstrip().endswith("| linkify_it"):
+            return int(line.split("|")[1]) / 1000
+    raise AssertionError("no linkify_it in importtime output:\n" + stderr)
+
+
+def test_import_time(benchmark, env):
+    times = []
+    benchmark.pedantic(lambda: times.append(import_time_ms(env)), rounds=10)
+
+    assert min(times) <= IMPORT_BUDGET_MS
+
+
+def test_import_is_lazy(env):
+    """Heavy modules are imported on first use only."""
+    code = "import sys, linkify_it; print(' '.join(sorted(sys.modules)))"
+    modules = run_python(env, "-c", code).stdout.split()
+
+    for name in ("uc_micro", "linkify_it.tlds", "concurrent.futures", "json"):
+        assert name not in modules
+
+
+@pytest.mark.parametrize("source_cache", [False, True])
+def test_first_call(benchmark, env, tmp_path, source_cache):
+    """Import, create a linkifier and match a short text in a new process.
+    With source cache, sources are loaded from disk (saved by first run).
+    """
+    env = dict(env)
+    if source_cache:
+        env["LINKIFY_IT_CACHE_DIR"] = str(tmp_path)
+        run_python(env, "-c", FIRST_CALL)
+
+    times = []
+    benchmark.pedantic(
+        lambda: times.append(float(run_python(env, "-c", FIRST_CALL).stdout)),
+        rounds=10,
+    )
+
+    assert min(times) <= FIRST_CALL_BUDGET_MS
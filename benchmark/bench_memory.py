@@ -0,0 +1,136 @@
+"""Memory benchmarks, measured with ``tracemalloc``.
+
+Scan benchmarks report, per MB of UTF-8 text scanned:
+
+- ``peak_per_mb`` - peak of memory allocated during the call
+- ``retained_per_mb`` - memory allocated by the call and still in use after it
+  (the result, and scan state cached by the instance)
+
+Instance benchmarks report the memory of one compiled linkifier (patterns
+included), and the mean memory per instance of ``INSTANCES`` linkifiers with
+the same configuration (patterns are shared).
+
+Numbers are stored in ``extra_info`` (saved by ``--benchmark-json``), and tests
+fail when they exceed budgets below (in bytes), multiplied by
+``LINKIFY_IT_MEMORY_BUDGET_SCALE`` environment variable (``1`` by default).
+Times are measured with ``tracemalloc`` running and are slower than usual.
+"""
+
+import gc
+import os
+import re
+import tracemalloc
+
+import pytest
+
+from benchmark import corpus
+from linkify_it import LinkifyIt
+from linkify_it.main import PATTERN_CACHE
+
+MB = 1000 * 1000
+
+INSTANCES = 100
+
+# Budgets of scan benchmarks, per MB scanned: (peak, retained)
+SCAN_BUDGETS = {
+    ("test", "document"): (0.1 * MB, 0.02 * MB),
+    ("test", "messages"): (0.25 * MB, 0.15 * MB),
+    ("match", "document"): (2 * MB, 2 * MB),
+    ("match", "messages"): (2.5 * MB, 2.5 * MB),
+    ("match_at_start", "document"): (0.1 * MB, 0.02 * MB),
+    ("match_at_start", "messages"): (2 * MB, 2 * MB),
+}
+
+# Budgets of instance benchmarks, bytes per instance
+INSTANCE_BUDGETS = {"one": 1.5 * MB, "many": 30 * 1000}
+
+BUDGET_SCALE = float(os.environ.get("LINKIFY_IT_MEMORY_BUDGET_SCALE", 1))
+
+
+def traced(func, *args):
+    """Call ``func`` with ``tracemalloc`` running.
+
+    Returns:
+        tuple: result, peak and retained memory in bytes
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func(*args)
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak, retained
+
+
+@pytest.fixture(scope="module")
+def messages():
+    return corpus.load()
+
+
+def inputs(method, kind, messages):
+    """Texts scanned in one measurement: one document, or corpus messages.
+
+    ``match_at_start`` texts start with a link.
+    """
+    if method == "match_at_start":
+        messages = ["http://example.com/" + text for text in messages]
+    if kind == "document":
+        return ["\n".join(messages)]
+    return messages
+
+
+@pytest.mark.parametrize("kind", ["document", "messages"])
+@pytest.mark.parametrize("method", ["test", "match", "match_at_start"])
+def test_scan_memory(benchmark, messages, method, kind):
+    linkify = LinkifyIt()
+    func = getattr(linkify, method)
+    texts = inputs(method, kind, messages)
+    mb = sum(len(text.encode("utf-8")) for text in texts) / MB
+    [func(text) for text in texts]
+
+    stats = []
+
+    def scan():
+        _, peak, retained = traced(lambda: [func(text) for text in texts])
+        stats.append((peak, retained))
+
+    benchmark.pedantic(scan, rounds=3)
+
+    peak, retained = (min(values) for values in zip(*stats))
+    benchmark.extra_info.update(
+        {"mb": round(mb, 3), "peak_per_mb": peak / mb, "retained_per_mb": retained / mb}
+    )
+
+    peak_budget, retained_budget = SCAN_BUDGETS[method, kind]
+    assert peak / mb <= peak_budget * BUDGET_SCALE
+    assert retained / mb <= retained_budget * BUDGET_SCALE
+
+
+def compiled_linkifier():
+    linkify = LinkifyIt()
+    linkify.match("ascii example.com, http://example.org, foo@example.com")
+    linkify.match("unicode пример.рф, http://example.org, foo@example.com")
+    return linkify
+
+
+@pytest.mark.parametrize("count", ["one", "many"])
+def test_instance_memory(benchmark, count):
+    """Memory of compiled linkifiers, created with empty pattern cache."""
+    number = 1 if count == "one" else INSTANCES
+    sizes = []
+
+    def create():
+        PATTERN_CACHE.clear()
+        re.purge()
+        _, peak, retained = traced(
+            lambda: [compiled_linkifier() for _ in range(number)]
+        )
+        sizes.append(retained / number)
+
+    benchmark.pedantic(create, rounds=3)
+
+    size = min(sizes)
+    benchmark.extra_info.update({"instances": number, "bytes_per_instance": size})
+
+    assert size <= INSTANCE_BUDGETS[count] * BUDGET_SCALE
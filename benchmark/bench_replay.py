@@ -0,0 +1,129 @@
+"""Per-message latency: replay a corpus of messages one call at a time.
+
+Each message of the corpus (``LINKIFY_IT_BENCH_CORPUS`` JSONL file, or the
+default generated one, see ``benchmark/corpus.py``) is passed to ``pretest``,
+``test`` or ``match`` in turn, and every call is timed.
+
+- ``warm`` replays use an instance which already scanned the corpus.
+- ``cold`` replays use a new instance with empty pattern cache (and ``re``
+  module cache), so the first calls include pattern compilation.
+
+Latency percentiles (``p50_us``, ``p95_us``, ``p99_us``, ``max_us``) and
+throughput (``messages_per_s``, ``mb_per_s``) are stored in ``extra_info`` and
+printed. The slowest messages are saved as JSONL to
+``LINKIFY_IT_BENCH_REPORT_DIR`` (a temporary directory by default), in corpus
+format, so they can be replayed with ``LINKIFY_IT_BENCH_CORPUS``.
+"""
+
+import json
+import os
+import re
+import statistics
+import time
+from pathlib import Path
+
+import pytest
+
+from benchmark import corpus
+from linkify_it import LinkifyIt
+from linkify_it.main import PATTERN_CACHE
+
+ROUNDS = 5
+
+# Number of slowest messages saved
+SLOWEST = 10
+
+
+@pytest.fixture(scope="module")
+def messages():
+    return corpus.load()
+
+
+@pytest.fixture(scope="module")
+def report_dir(tmp_path_factory):
+    path = os.environ.get("LINKIFY_IT_BENCH_REPORT_DIR")
+    if not path:
+        return tmp_path_factory.mktemp("replay")
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def replay(func, messages):
+    """Call ``func`` on each message.
+
+    Returns:
+        list: call durations in nanoseconds
+    """
+    clock = time.perf_counter_ns
+    latencies = []
+    for text in messages:
+        start = clock()
+        func(text)
+        latencies.append(clock() - start)
+    return latencies
+
+
+def summary(runs, messages):
+    """Latency percentiles and throughput of replay runs, in ``extra_info``
+    format.
+    """
+    latencies = [latency for run in runs for latency in run]
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    total = sum(latencies) / 1e9
+    size = sum(len(text.encode("utf-8")) for text in messages) * len(runs)
+    return {
+        "messages": len(messages),
+        "p50_us": percentiles[49] / 1000,
+        "p95_us": percentiles[94] / 1000,
+        "p99_us": percentiles[98] / 1000,
+        "max_us": max(latencies) / 1000,
+        "messages_per_s": len(latencies) / total,
+        "mb_per_s": size / 1e6 / total,
+    }
+
+
+def save_slowest(path, runs, messages):
+    """Save the slowest messages with their best time of all runs.
+
+    Best time filters out one-off delays, so these messages are slow to scan,
+    not unlucky. Cold runs keep their first call, it includes compilation.
+    """
+    best = [min(times) for times in zip(*runs)]
+    slowest = sorted(range(len(messages)), key=best.__getitem__, reverse=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for index in slowest[:SLOWEST]:
+            message = {"id": index, "us": best[index] / 1000, "text": messages[index]}
+            f.write(json.dumps(message, ensure_ascii=False) + "\n")
+    return [{"id": index, "us": best[index] / 1000} for index in slowest[:SLOWEST]]
+
+
+@pytest.mark.parametrize("state", ["warm", "cold"])
+@pytest.mark.parametrize("method", ["pretest", "test", "match"])
+def test_replay(benchmark, capsys, messages, report_dir, method, state):
+    warm = LinkifyIt()
+    warm.match_many(messages)
+    runs = []
+
+    def setup():
+        if state == "cold":
+            PATTERN_CACHE.clear()
+            re.purge()
+            return (getattr(LinkifyIt(), method),), {}
+        return (getattr(warm, method),), {}
+
+    benchmark.pedantic(
+        lambda func: runs.append(replay(func, messages)), setup=setup, rounds=ROUNDS
+    )
+
+    info = summary(runs, messages)
+    path = report_dir / "slowest-{}-{}.jsonl".format(method, state)
+    info["slowest"] = save_slowest(path, runs, messages)
+    benchmark.extra_info.update(info)
+
+    with capsys.disabled():
+        print(
+            "\n{} {}: p50 {p50_us:.1f} us, p95 {p95_us:.1f} us, p99 {p99_us:.1f} us, "
+            "max {max_us:.0f} us, {messages_per_s:.0f} msg/s, {mb_per_s:.2f} MB/s, "
+            "slowest: {}".format(method, state, path, **info)
+        )
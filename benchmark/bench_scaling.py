@@ -0,0 +1,212 @@
+"""Scaling benchmarks: how scan time depends on input size, link density, link
+kinds, Unicode script, and on adversarial inputs.
+
+Every benchmark stores time per MB of UTF-8 text (``ms_per_mb``) in
+``extra_info``. It is shown with ``--benchmark-columns`` and saved by
+``--benchmark-json``. ``test_growth`` times inputs of growing size. It fails
+when time grows much faster than size, so super-linear behaviour is caught even
+without stored results to compare against.
+
+Inputs larger than ``LINKIFY_IT_BENCH_MAX_SIZE`` (bytes, 1 MB by default) are
+skipped. Set it to ``100000000`` for the full 1 KB - 100 MB range.
+"""
+
+import os
+import random
+import time
+
+import pytest
+
+from linkify_it import LinkifyIt
+
+KB = 1000
+MB = 1000 * KB
+
+MAX_SIZE = int(os.environ.get("LINKIFY_IT_BENCH_MAX_SIZE", MB))
+
+# Max time ratio of input 10x larger. Linear scans give ~10.
+GROWTH_LIMIT = 25
+
+WORDS = {
+    "latin": "lorem ipsum dolor sit amet consectetur adipiscing elit sed do".split(),
+    "cyrillic": "съешь же ещё этих мягких французских булок да выпей чаю".split(),
+    "cjk": "我能吞下玻璃而不伤身体 私はガラスを食べられます 나는 유리를 먹을 수 있어요".split(),
+    "arabic": "أنا قادر على أكل الزجاج و هذا لا يؤلمني".split(),
+    "emoji": "😀 🎉 🚀 👍🏽 ❤️ 🇯🇵 🧑‍💻".split(),
+}
+
+LINKS = {
+    "schema": ["http://example.com/path?q=1", "https://github.com/a/b", "//cdn.net/x"],
+    "fuzzy": ["example.org/page", "www.python.org", "docs.example.net/a_(b)"],
+    "email": ["user@example.com", "first.last@mail.example.org"],
+    "ip": ["192.168.0.1:8080/status", "10.0.0.1"],
+    "unicode": ["пример.рф", "http://例子.测试/路径", "münchen.de/straße"],
+}
+
+# Adversarial inputs: unit repeated up to the size
+ADVERSARIAL = {
+    "dots": "a.",
+    "digit_dots": "1.",
+    "long_labels": "a" * 70 + ".",
+    "at_signs": "@",
+    "at_words": "a@",
+    "quotes": 'a"',
+    "hyphens": "a-",
+    "colons": "a:",
+    "slashes": "/",
+    "schema_prefixes": "http://",
+    "astral": "😀",
+    "astral_dots": "😀.",
+}
+
+
+def document(size, density=5, kinds=("schema", "fuzzy", "email"), script="latin"):
+    """Text of about ``size`` bytes, with ``density`` links per KB.
+
+    Deterministic: the same arguments give the same text.
+    """
+    rnd = random.Random(size * 31 + density)
+    words = WORDS[script]
+    links = [link for kind in kinds for link in LINKS[kind]]
+
+    # Build one 10 KB block and repeat it, generating 100 MB word by word is
+    # much slower than scanning it
+    block_size = min(size, 10 * KB)
+    parts = []
+    length = 0
+    next_link = KB / density if density else float("inf")
+    while length < block_size:
+        if length >= next_link:
+            part = rnd.choice(links)
+            next_link += KB / density
+        else:
+            part = rnd.choice(words)
+        parts.append(part)
+        length += len(part.encode("utf-8")) + 1
+    block = " ".join(parts) + "\n"
+
+    return block * max(1, size // len(block.encode("utf-8")))
+
+
+def adversarial(name, size, url=False):
+    """Adversarial unit repeated up to ``size`` chars. With ``url``, it is
+    the path of a link.
+    """
+    unit = ADVERSARIAL[name]
+    text = unit * max(1, size // len(unit))
+    return "http://example.com/" + text if url else text
+
+
+def nested_brackets(size):
+    """Link with a path of deeply nested brackets."""
+    depth = size // 4
+    return "http://example.com/" + "[(" * depth + ")]" * depth
+
+
+def linkifier(scanner="regex"):
+    linkify = LinkifyIt(options={"fuzzy_ip": True, "scanner": scanner})
+    linkify.match("warm up http://a.com b.com c@d.com 1.2.3.4 пример.рф")
+    return linkify
+
+
+def run(benchmark, func, text):
+    """Benchmark ``func(text)`` and record time per MB."""
+    mb = len(text.encode("utf-8")) / MB
+    rounds = max(1, min(20, int(2 / mb)))
+    benchmark.extra_info["mb"] = round(mb, 3)
+    benchmark.pedantic(func, args=(text,), rounds=rounds, iterations=1)
+    if benchmark.stats:
+        benchmark.extra_info["ms_per_mb"] = benchmark.stats.stats.min * 1000 / mb
+
+
+def best_time(func, text, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+@pytest.mark.benchmark(group="size")
+@pytest.mark.parametrize("scanner", ["regex", "anchor"])
+@pytest.mark.parametrize("method", ["test", "match"])
+@pytest.mark.parametrize(
+    "size",
+    [KB, 10 * KB, 100 * KB, MB, 10 * MB, 100 * MB],
+    ids=["1KB", "10KB", "100KB", "1MB", "10MB", "100MB"],
+)
+def test_size(benchmark, size, method, scanner):
+    if size > MAX_SIZE:
+        pytest.skip("input larger than LINKIFY_IT_BENCH_MAX_SIZE")
+    linkify = linkifier(scanner)
+
+    run(benchmark, getattr(linkify, method), document(size))
+
+
+@pytest.mark.benchmark(group="density")
+@pytest.mark.parametrize("density", [0, 1, 10, 50])
+def test_density(benchmark, density):
+    """Match 100 KB with ``density`` links per KB."""
+    run(benchmark, linkifier().match, document(100 * KB, density=density))
+
+
+@pytest.mark.benchmark(group="kinds")
+@pytest.mark.parametrize(
+    "kinds",
+    [("schema",), ("fuzzy",), ("email",), ("ip",), ("schema", "fuzzy", "email")],
+    ids=["schema", "fuzzy", "email", "ip", "mixed"],
+)
+def test_kinds(benchmark, kinds):
+    """Match 100 KB with 10 links per KB of given kinds."""
+    run(benchmark, linkifier().match, document(100 * KB, density=10, kinds=kinds))
+
+
+@pytest.mark.benchmark(group="script")
+@pytest.mark.parametrize("script", sorted(WORDS))
+def test_script(benchmark, script):
+    """Match 100 KB of text in ``script``, with ASCII and Unicode links."""
+    text = document(
+        100 * KB, density=5, kinds=("schema", "fuzzy", "unicode"), script=script
+    )
+    run(benchmark, linkifier().match, text)
+
+
+@pytest.mark.benchmark(group="adversarial")
+@pytest.mark.parametrize("scanner", ["regex", "anchor"])
+@pytest.mark.parametrize("name", sorted(ADVERSARIAL) + ["nested_brackets"])
+def test_adversarial(benchmark, name, scanner):
+    """Match 100 KB of adversarial input."""
+    if name == "nested_brackets":
+        text = nested_brackets(100 * KB)
+    else:
+        text = adversarial(name, 100 * KB)
+    run(benchmark, linkifier(scanner).match, text)
+
+
+GROWTH_INPUTS = {
+    "document": document,
+    "nested_brackets": nested_brackets,
+    **{name: (lambda size, name=name: adversarial(name, size)) for name in ADVERSARIAL},
+    **{
+        "path_" + name: (lambda size, name=name: adversarial(name, size, url=True))
+        for name in ("dots", "quotes", "hyphens")
+    },
+}
+
+
+@pytest.mark.parametrize("scanner", ["regex", "anchor"])
+@pytest.mark.parametrize("name", sorted(GROWTH_INPUTS))
+def test_growth(name, scanner):
+    """``match()`` time of 200 KB input is at most ``GROWTH_LIMIT`` times the
+    time of 20 KB input.
+    """
+    linkify = linkifier(scanner)
+    build = GROWTH_INPUTS[name]
+
+    small = best_time(linkify.match, build(20 * KB))
+    large = best_time(linkify.match, build(200 * KB))
+
+    assert large / small < GROWTH_LIMIT, "{:.1f}x slower on 10x input".format(
+        large / small
+    )
@@ -0,0 +1,353 @@
+"""Seeded generator of synthetic message corpora for benchmarks.
+
+Messages are built from word lists and generated links, with tunable length
+distribution, link density, link kinds, root zones, Unicode scripts and
+markup. The same parameters and seed always give the same corpus, and nothing
+is downloaded.
+
+Corpora are stored as JSONL, one ``{"id": ..., "text": ...}`` object per line::
+
+    python -m benchmark.corpus corpus.jsonl --count 10000 --seed 1 \\
+        --kinds schema=4,fuzzy=3,email=2,ip=1 --tlds iana \\
+        --scripts latin=6,cyrillic=2,cjk=1,arabic=1 --markup plain=2,markdown=1
+
+Benchmarks read the corpus named by ``LINKIFY_IT_BENCH_CORPUS`` environment
+variable, or generate the default one (see :func:`load`).
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+from pathlib import Path
+
+from linkify_it.tlds import TLDS
+
+WORDS = {
+    "latin": (
+        "the of and to in is that it for on with as was at by this be from or "
+        "have an are not but all can new more will one about which also time "
+        "release build fixed please check see thanks update deploy review docs"
+    ).split(),
+    "cyrillic": (
+        "и в не на что с по это как из но он для то же все так его от только "
+        "смотри ссылка спасибо обновление сборка проверь документация сайт"
+    ).split(),
+    "cjk": (
+        "的 是 在 了 不 和 有 我 这 请 看 链接 谢谢 更新 文档 の に は を た が "
+        "です ます リンク 確認 更新 資料 이 그 저 것 수 링크 확인 감사 문서"
+    ).split(),
+    "arabic": (
+        "في من على إلى عن مع هذا هذه كان التي الذي رابط شكرا تحديث راجع الموقع "
+        "الوثائق انظر"
+    ).split(),
+    "emoji": "😀 😂 🎉 🚀 👍 👍🏽 ❤️ 🔥 ✅ 🇯🇵 🧑‍💻 🙏".split(),
+}
+
+# Domain labels. Scripts without IDN labels use ASCII ones
+LABELS = {
+    "latin": (
+        "example github python docs mail news shop blog cdn api static files "
+        "my-site test2 app portal"
+    ).split(),
+    "cyrillic": "пример сайт почта новости магазин документы".split(),
+    "cjk": "例子 测试 网站 文档 例え サイト 예시 사이트".split(),
+    "arabic": "مثال موقع بريد اخبار".split(),
+}
+
+# Root zones of IDN labels, used instead of the chosen zone with `idn` chance
+IDN_TLDS = {
+    "cyrillic": ["рф", "бел", "укр", "com"],
+    "cjk": ["中国", "みんな", "한국", "com"],
+    "arabic": ["مصر", "السعودية", "net"],
+}
+
+# Frequent zones, weighted roughly by popularity
+COMMON_TLDS = {
+    "com": 40,
+    "org": 8,
+    "net": 6,
+    "de": 4,
+    "uk": 3,
+    "ru": 3,
+    "jp": 2,
+    "io": 2,
+    "info": 1,
+    "dev": 1,
+    "app": 1,
+    "рф": 1,
+}
+
+SCHEMAS = {"http://": 3, "https://": 6, "ftp://": 1, "//": 1}
+
+DEFAULTS = {
+    "count": 1000,
+    "seed": 0,
+    "length_median": 120,
+    "length_sigma": 1.0,
+    "max_length": 5000,
+    "density": 5.0,
+    "kinds": {"schema": 4, "fuzzy": 3, "email": 2, "ip": 1},
+    "tlds": "common",
+    "scripts": {"latin": 1},
+    "markup": {"plain": 1},
+    "idn": 0.3,
+}
+
+
+class _Weighted:
+    """Random choice from ``{item: weight}``."""
+
+    def __init__(self, weights):
+        self.items = [item for item, weight in weights.items() if weight > 0]
+        if not self.items:
+            raise ValueError("No items with positive weight: {!r}".format(weights))
+        self.weights = [weights[item] for item in self.items]
+
+    def __call__(self, rnd):
+        return rnd.choices(self.items, self.weights)[0]
+
+
+def _tlds_weights(tlds):
+    if tlds == "common":
+        return COMMON_TLDS
+    if tlds == "iana":
+        return {tld.lower(): 1 for tld in TLDS}
+    if isinstance(tlds, str):
+        raise ValueError("Unknown tlds {!r}, expected common or iana".format(tlds))
+    if isinstance(tlds, dict):
+        return tlds
+    return {tld: 1 for tld in tlds}
+
+
+class _Generator:
+    def __init__(self, params):
+        self.params = params
+        self.rnd = random.Random(params["seed"])
+        self.kind = _Weighted(params["kinds"])
+        self.tld = _Weighted(_tlds_weights(params["tlds"]))
+        self.script = _Weighted(params["scripts"])
+        self.markup = _Weighted(params["markup"])
+        self.schema = _Weighted(SCHEMAS)
+
+        unknown = set(params["scripts"]) - set(WORDS)
+        if unknown:
+            raise ValueError("Unknown scripts: {}".format(", ".join(sorted(unknown))))
+        unknown = set(params["kinds"]) - {"schema", "fuzzy", "email", "ip"}
+        if unknown:
+            raise ValueError("Unknown kinds: {}".format(", ".join(sorted(unknown))))
+        unknown = set(params["markup"]) - {"plain", "markdown", "html"}
+        if unknown:
+            raise ValueError("Unknown markup: {}".format(", ".join(sorted(unknown))))
+
+    def length(self):
+        median = self.params["length_median"]
+        length = self.rnd.lognormvariate(math.log(median), self.params["length_sigma"])
+        return max(1, min(self.params["max_length"], int(length)))
+
+    def host(self, script):
+        rnd = self.rnd
+        if script in IDN_TLDS and rnd.random() < self.params["idn"]:
+            labels, tld = LABELS[script], rnd.choice(IDN_TLDS[script])
+        else:
+            labels, tld = LABELS["latin"], self.tld(rnd)
+        parts = [rnd.choice(labels) for _ in range(rnd.choice((1, 1, 1, 2, 3)))]
+        return ".".join(parts + [tld])
+
+    def path(self):
+        rnd = self.rnd
+        choice = rnd.random()
+        if choice < 0.4:
+            return ""
+        if choice < 0.8:
+            return "/" + "/".join(
+                rnd.choice(LABELS["latin"]) for _ in range(rnd.randint(1, 3))
+            )
+        if choice < 0.9:
+            return "/search?q={}&page={}".format(
+                rnd.choice(LABELS["latin"]), rnd.randint(1, 99)
+            )
+        return "/wiki/{}_({})#section".format(
+            rnd.choice(LABELS["latin"]), rnd.choice(LABELS["latin"])
+        )
+
+    def ip(self):
+        rnd = self.rnd
+        ip = ".".join(str(rnd.randint(1, 254)) for _ in range(4))
+        if rnd.random() < 0.5:
+            ip += ":{}".format(rnd.choice((80, 443, 8000, 8080, 9000)))
+        return ip
+
+    def link(self, script):
+        """Return ``(url, kind)``."""
+        rnd = self.rnd
+        kind = self.kind(rnd)
+        if kind == "schema":
+            return self.schema(rnd) + self.host(script) + self.path(), kind
+        if kind == "fuzzy":
+            prefix = "www." if rnd.random() < 0.3 else ""
+            return prefix + self.host(script) + self.path(), kind
+        if kind == "email":
+            user = rnd.choice(LABELS["latin"])
+            if rnd.random() < 0.3:
+                user += "." + rnd.choice(LABELS["latin"])
+            return user + "@" + self.host(script), kind
+        return "http://" + self.ip() + self.path(), kind
+
+    def wrap_link(self, url, kind, markup, words):
+        rnd = self.rnd
+        if markup == "markdown":
+            choice = rnd.random()
+            if kind == "schema" and choice < 0.5:
+                return "[{}]({})".format(rnd.choice(words), url)
+            if kind == "schema" and choice < 0.7:
+                return "<{}>".format(url)
+            if choice < 0.1:
+                return "`{}`".format(url)
+            return url
+        if markup == "html":
+            if kind == "schema":
+                return '<a href="{}">{}</a>'.format(url, rnd.choice(words))
+            if kind == "email" and rnd.random() < 0.5:
+                return '<a href="mailto:{0}">{0}</a>'.format(url)
+            return url
+        return url
+
+    def wrap_message(self, text, markup):
+        rnd = self.rnd
+        if markup == "markdown":
+            choice = rnd.random()
+            if choice < 0.2:
+                return "- " + text
+            if choice < 0.3:
+                return "> " + text
+            if choice < 0.4:
+                return "**{}**".format(text)
+            return text
+        if markup == "html":
+            return "<p>{}</p>".format(text.replace("\n", "<br>"))
+        return text
+
+    def message(self):
+        rnd = self.rnd
+        script = self.script(rnd)
+        markup = self.markup(rnd)
+        words = WORDS[script]
+        density = self.params["density"] / 1000
+
+        length = self.length()
+        parts = []
+        size = 0
+        while size < length:
+            word = rnd.choice(words)
+            if rnd.random() < density * (len(word) + 1):
+                url, kind = self.link(script)
+                word = self.wrap_link(url, kind, markup, words)
+            elif rnd.random() < 0.08:
+                word += rnd.choice(",.!?:;")
+            elif rnd.random() < 0.01:
+                word += "\n"
+            parts.append(word)
+            size += len(word) + 1
+        return self.wrap_message(" ".join(parts), markup)
+
+
+def generate(**params):
+    """Generate a corpus.
+
+    Args:
+        count (int): Optional. Number of messages.
+        seed (int): Optional. Random seed, same seed and parameters give the
+            same messages.
+        length_median (int): Optional. Median message length in chars.
+            Lengths follow a log-normal distribution.
+        length_sigma (float): Optional. Sigma of the log-normal length
+            distribution, ``0`` makes all messages the same length.
+        max_length (int): Optional. Longest message length.
+        density (float): Optional. Mean number of links per 1000 chars.
+        kinds (dict): Optional. Weights of link kinds: ``schema``, ``fuzzy``,
+            ``email`` and ``ip`` (IP hosts, with schema).
+        tlds (str | list | dict): Optional. Root zones of generated hosts:
+            ``"common"`` (frequent zones, ``COMMON_TLDS``), ``"iana"`` (full
+            ``linkify_it.tlds.TLDS`` list, uniformly), a list of zones or a
+            dict of weights. Default linkifier doesn't recognize fuzzy links
+            with most IANA zones, as in real texts.
+        scripts (dict): Optional. Weights of message scripts: ``latin``,
+            ``cyrillic``, ``cjk``, ``arabic`` and ``emoji``.
+        markup (dict): Optional. Weights of message markup: ``plain``,
+            ``markdown`` and ``html``.
+        idn (float): Optional. Chance of a host with labels and zone in
+            message script (cyrillic, cjk and arabic).
+
+    Returns:
+        list: ``{"id": int, "text": str}`` dicts
+    """
+    unknown = set(params) - set(DEFAULTS)
+    if unknown:
+        raise TypeError("Unknown parameters: {}".format(", ".join(sorted(unknown))))
+    params = {**DEFAULTS, **params}
+
+    generator = _Generator(params)
+    return [{"id": i, "text": generator.message()} for i in range(params["count"])]
+
+
+def write(path, messages):
+    """Write messages to JSONL file."""
+    with open(path, "w", encoding="utf-8") as f:
+        for message in messages:
+            f.write(json.dumps(message, ensure_ascii=False) + "\n")
+
+
+def read(path):
+    """Read messages from JSONL file."""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def load():
+    """Corpus from ``LINKIFY_IT_BENCH_CORPUS`` file, or default generated one.
+
+    Returns:
+        list: message texts
+    """
+    path = os.environ.get("LINKIFY_IT_BENCH_CORPUS")
+    messages = read(path) if path else generate()
+    return [message["text"] for message in messages]
+
+
+def _weights(value):
+    """Parse ``a=1,b=2`` into dict."""
+    weights = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        weights[name.strip()] = float(weight) if weight else 1.0
+    return weights
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmark.corpus", description=__doc__.split("\n")[0]
+    )
+    parser.add_argument("output", type=Path, help="JSONL file to write")
+    for name in ("count", "seed", "length_median", "max_length"):
+        parser.add_argument("--" + name.replace("_", "-"), type=int)
+    for name in ("length_sigma", "density", "idn"):
+        parser.add_argument("--" + name.replace("_", "-"), type=float)
+    for name in ("kinds", "scripts", "markup"):
+        parser.add_argument("--" + name, type=_weights, metavar="NAME=WEIGHT,...")
+    parser.add_argument(
+        "--tlds", help="common, iana, or comma separated zones list", metavar="TLDS"
+    )
+    options = vars(parser.parse_args(args))
+
+    output = options.pop("output")
+    params = {name: value for name, value in options.items() if value is not None}
+    if params.get("tlds") not in (None, "common", "iana"):
+        params["tlds"] = params["tlds"].split(",")
+
+    write(output, generate(**params))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Regex engines, which compile linkify patterns.
+
+An engine turns pattern sources (``LinkifyIt.re``) into compiled patterns.
+Scanners use only this part of the compiled pattern API, so any engine
+providing it can be plugged in:
+
+- ``pattern.search(text, pos)`` - first match at or after ``pos``
+- ``pattern.match(text, pos)`` - match exactly at ``pos``
+- ``pattern.finditer(text, pos)`` - all matches from ``pos``
+
+Results must support ``start()``, ``end()``, ``span()``, ``group()``,
+``groups()`` and named groups, as ``re.Match`` does.
+
+Sources use ``re`` syntax, with scoped ``(?-i:...)`` flags. Unicode classes
+are case sensitive, and ``i`` is listed with ``İ`` and ``ı`` (``re`` matches
+them with ``IGNORECASE``), so engines with other Unicode data or case folding
+find the same links.
+"""
+
+import functools
+import importlib
+
+
+class Engine:
+    """Python ``re`` module, the default engine.
+
+    Subclasses can set another ``module`` with ``re`` compatible API, or
+    override :meth:`compile`.
+    """
+
+    #: Engine name, value of ``engine`` option
+    name = "re"
+
+    #: Module to import
+    module = "re"
+
+    def __init__(self):
+        self._module = importlib.import_module(self.module)
+
+    @classmethod
+    def available(cls):
+        """Check if engine module can be imported.
+
+        Returns:
+            bool: ``True`` if engine can be used
+        """
+        try:
+            importlib.import_module(cls.module)
+        except ImportError:
+            return False
+        return True
+
+    def compile(self, src, ascii=False):
+        """Compile pattern source, case insensitive.
+
+        Args:
+            src (str): pattern source
+            ascii (bool): Optional. Pattern is used only on ASCII texts, ASCII
+                only case folding can be used.
+
+        Returns:
+            compiled pattern
+        """
+        flags = self._module.IGNORECASE
+        if ascii:
+            flags |= self._module.ASCII
+        return self._module.compile(src, flags=flags)
+
+    def __getstate__(self):
+        # Modules can't be pickled, the module is imported again on load
+        state = dict(self.__dict__)
+        state.pop("_module", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._module = importlib.import_module(self.module)
+
+    def __repr__(self):
+        return "<{} engine>".format(self.name)
+
+
+class RegexEngine(Engine):
+    """Third party `regex <https://pypi.org/project/regex/>`_ module."""
+
+    name = "regex"
+    module = "regex"
+
+
+# Values of `engine` option
+ENGINES = {"re": Engine, "regex": RegexEngine}
+
+
+@functools.lru_cache(maxsize=None)
+def _create_engine(name):
+    return ENGINES[name]()
+
+
+def get_engine(engine=None):
+    """Return engine by name. Falls back to ``re`` if the engine module is not
+    installed.
+
+    Args:
+        engine (str | :class:`Engine`): Optional. Engine name (see
+            ``ENGINES``), or instance. ``re`` by default.
+
+    Returns:
+        :class:`Engine`: shared instance for names
+    """
+    if isinstance(engine, Engine):
+        return engine
+
+    name = engine or "re"
+    if name not in ENGINES:
+        raise ValueError(
+            "Unknown engine {!r}, expected one of: {}".format(
+                name, ", ".join(sorted(ENGINES))
+            )
+        )
+    if not ENGINES[name].available():
+        name = "re"
+    return _create_engine(name)
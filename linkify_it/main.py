@@ -1,24 +1,320 @@
-import copy
+import collections
+import contextlib
+import functools
+import heapq
+import importlib
+import os
 import re
+import string
+import sys
+import threading
 import types
 
-from .ucre import build_re
+from .engines import get_engine
+from .ucre import SRC_I_VARIANTS, add_ascii_classes, ascii_classes, ascii_src, build_re
 
 # py>=37: re.Pattern, else: _sre.SRE_Pattern
 RE_TYPE = type(re.compile(r""))
 
+RE_MAILTO = re.compile(r"^mailto:", flags=re.IGNORECASE)
+
+# Marks missing cache entries, where ``None`` is a valid cached value
+_MISS = object()
+
+# Empty `LinkifyIt` scan cache: (core, text, (schema, index, last_index))
+_NO_SCAN = (None, "", ("", -1, -1))
+
+
+# Literal ``i`` is written as a class with its ``re.IGNORECASE`` variants, so
+# all engines match the same
+_I_VARIANTS = "i" + SRC_I_VARIANTS
+
+RE_I_VARIANT = re.compile("[iI\u0130\u0131]")
+
 
 def _escape_re(string):
-    return re.sub(r"([.?*+^$[\]\\(){}|-])", r"\\\1", string)
+    src = re.sub(r"([.?*+^$[\]\\(){}|-])", r"\\\1", string)
+    return RE_I_VARIANT.sub("[" + _I_VARIANTS + "]", src)
+
+
+def _escape_class_re(char):
+    """Escape ``char`` for use inside ``[]`` class."""
+    if RE_I_VARIANT.match(char):
+        return _I_VARIANTS
+    return re.sub(r"([\]\\^-])", r"\\\1", char)
+
+
+# Tld without regexp syntax, can be merged into a trie
+RE_PLAIN_TLD = re.compile(r"^[\w\-]+$")
+
+
+def _trie_re(node):
+    """Build regexp source of trie ``node`` (char -> child node, ``""`` marks
+    end of a word).
+    """
+    # Words ending with the next char are merged into one char class
+    leaves = sorted(char for char, child in node.items() if child == {"": {}})
+    branches = [
+        _escape_re(char) + _trie_re(child)
+        for char, child in sorted(node.items())
+        if char and char not in leaves
+    ]
+
+    if len(leaves) == 1:
+        branches.append(_escape_re(leaves[0]))
+    elif leaves:
+        branches.append("[" + "".join(_escape_class_re(char) for char in leaves) + "]")
+
+    if not branches:
+        return ""
+
+    if len(branches) == 1:
+        src = branches[0]
+        single = len(leaves) == 1 or len(leaves) > 1 and len(node) == len(leaves)
+    else:
+        src = "(?:" + "|".join(branches) + ")"
+        single = True
+
+    if "" not in node:
+        return src
+    return src + "?" if single else "(?:" + src + ")?"
+
+
+def _tlds_re(tlds):
+    """Join tlds into one regexp source.
+
+    Plain tld names are merged into a prefix trie (``c(?:o(?:m|op)?|...)``), so
+    the regexp engine branches once per char instead of once per tld. Items
+    with regexp syntax are kept as is, after the trie.
+
+    Args:
+        tlds (list): tld names or regexp sources
+
+    Returns:
+        str: regexp source
+    """
+    trie = {}
+    others = []
+
+    for tld in tlds:
+        if not RE_PLAIN_TLD.match(tld):
+            others.append(tld)
+            continue
+
+        node = trie
+        for char in tld.lower():
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    sources = [_trie_re(trie)] if trie else []
+    return "|".join(sources + others)
+
+
+@functools.lru_cache(maxsize=8)
+def _expand_2ch_tlds(src):
+    """All 2-letter tlds matched by ``src`` regexp (``tlds_2ch_src_re``)."""
+    pattern = re.compile("(?:" + src + ")$", flags=re.IGNORECASE)
+    letters = string.ascii_lowercase
+    return frozenset(
+        first + second
+        for first in letters
+        for second in letters
+        if pattern.match(first + second)
+    )
+
+
+def _fold(string):
+    """Case fold ``string`` for case insensitive ``in`` checks.
+
+    Chars matched by ``re.IGNORECASE`` fold the same, except dotted ``İ`` and
+    dotless ``ı``, which match ``i``.
+    """
+    return string.replace("\u0130", "i").casefold().replace("\u0131", "i")
+
+
+def _link_triggers(names):
+    """Strings, one of which every text with a link contains.
+
+    Each schema link contains the last char of schema name, fuzzy links
+    contain ``.`` or ``localhost``, and emails contain ``@``. Cased chars are
+    checked in case folded text, see :func:`_fold`.
+
+    Args:
+        names (list): schema names
+
+    Returns:
+        tuple: (strings to find in text, strings to find in folded text)
+    """
+    plain = {".", "@"}
+    folded = {"localhost"}
+
+    for name in names:
+        last = name[-1]
+        if last.lower() == last.upper() == last.casefold():
+            plain.add(last)
+        else:
+            folded.add(_fold(name))
+
+    return tuple(sorted(plain)), tuple(sorted(folded))
+
 
+def _at_start_variant(src):
+    """Build variant of ``(^|prefix)...`` pattern, which matches only with empty
+    prefix. Returns ``None`` if ``src`` has no such leading group.
 
-def _index_of(text, search_value):
-    try:
-        result = text.index(search_value)
-    except ValueError:
-        result = -1
+    Scanning with ``pattern.search(text, pos)`` never matches ``^`` at ``pos``,
+    while ``pattern.search(text[pos:])`` does. Trying this variant at ``pos``
+    first gives the same results without copying the tail.
+    """
+    if not src.startswith("(^|"):
+        return None
 
-    return result
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(src):
+        char = src[i]
+        if char == "\\":
+            i += 2
+            continue
+        if in_class:
+            if char == "]":
+                in_class = False
+        elif char == "[":
+            in_class = True
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if not depth:
+                return "()" + src[i + 1 :]
+        i += 1
+
+    return None
+
+
+def _anchored_variant(regex):
+    """Build ``regex`` variant without its leading ``^``, which gives the same
+    result with ``regex.match(text, pos)`` as ``regex.search(text[pos:])``.
+    Returns ``None`` if there is no such variant.
+
+    Only a sole top-level anchor can be dropped. Top-level ``|`` has other
+    alternatives which ``match()`` can't anchor, and other anchors, word
+    boundaries and lookbehinds look at the text before ``pos``, which the tail
+    doesn't have.
+    """
+    src = regex.pattern
+    if not isinstance(src, str) or not src.startswith("^"):
+        return None
+    if regex.flags & re.VERBOSE:
+        return None
+
+    depth = 0
+    in_class = False
+    i = 1
+    while i < len(src):
+        char = src[i]
+        if char == "\\":
+            if not in_class and src[i + 1 : i + 2] in ("A", "b", "B"):
+                return None
+            i += 2
+            continue
+        if in_class:
+            if char == "]":
+                in_class = False
+        elif char == "[":
+            in_class = True
+            # ``]`` right after ``[`` or ``[^`` is a literal
+            if src[i + 1 : i + 2] == "^":
+                i += 1
+            if src[i + 1 : i + 2] == "]":
+                i += 1
+        elif char == "^":
+            return None
+        elif char == "|" and not depth:
+            return None
+        elif char == "(":
+            if src[i + 1 : i + 4] in ("?<=", "?<!"):
+                return None
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        i += 1
+
+    return re.compile(src[1:], flags=regex.flags)
+
+
+def _resolve_ref(ref):
+    """Import object by ``"module:qualname"`` reference."""
+    module, _, qualname = ref.partition(":")
+    obj = importlib.import_module(module)
+    for attr in qualname.split("."):
+        obj = getattr(obj, attr)
+    return obj
+
+
+class _Ref:
+    """Importable reference (``"module:qualname"``) to a schema handler function.
+
+    Used in :meth:`LinkifyIt.snapshot` instead of the function itself, so the
+    snapshot can be pickled and rebuilt in another process.
+    """
+
+    __slots__ = ("ref",)
+
+    def __init__(self, ref):
+        self.ref = ref
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.ref!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, _Ref) and other.ref == self.ref
+
+    def __hash__(self):
+        return hash(self.ref)
+
+    def __getstate__(self):
+        return self.ref
+
+    def __setstate__(self, state):
+        self.ref = state
+
+    @classmethod
+    def from_callable(cls, linkifyit, schema, func):
+        """Reference to ``func``. Methods must be bound to ``linkifyit``."""
+        if isinstance(func, types.MethodType):
+            if func.__self__ is not linkifyit:
+                raise SchemaError(schema, func)
+            func = func.__func__
+
+        ref = f"{func.__module__}:{func.__qualname__}"
+        try:
+            importable = _resolve_ref(ref) is func
+        except (ImportError, AttributeError):
+            importable = False
+
+        if not importable:
+            # lambdas, closures & other not importable functions
+            raise SchemaError(schema, func)
+
+        return cls(ref)
+
+    def resolve(self):
+        return _resolve_ref(self.ref)
+
+
+# LinkifyIt of `LinkifyIt.parallel_match` worker process
+_worker_linkifyit = None
+
+
+def _init_worker(cls, snapshot):
+    global _worker_linkifyit
+    _worker_linkifyit = cls.from_snapshot(snapshot)
+
+
+def _match_chunk(texts):
+    return _worker_linkifyit.match_many(texts)
 
 
 class SchemaError(Exception):
@@ -32,6 +328,10 @@ class SchemaError(Exception):
 class Match:
     """Match result.
 
+    ``raw``, ``text`` and ``url`` are computed on first access: match keeps only
+    offsets and a reference to the scanned text until then, and the schema
+    normalizer runs when ``text`` or ``url`` is first read (or set).
+
     Attributes:
         schema (str): Prefix (protocol) for matched string.
         index (int): First position of matched string.
@@ -45,10 +345,27 @@ class Match:
         shift (int): text searh position
     """
 
+    __slots__ = (
+        "schema",
+        "index",
+        "last_index",
+        "_source",
+        "_raw",
+        "_text",
+        "_url",
+        "_normalize",
+    )
+
     def __repr__(self):
-        return (
-            f"{self.__class__.__module__}.{self.__class__.__name__}({self.__dict__!r})"
-        )
+        fields = {
+            "schema": self.schema,
+            "index": self.index,
+            "last_index": self.last_index,
+            "raw": self.raw,
+            "text": self.text,
+            "url": self.url,
+        }
+        return f"{self.__class__.__module__}.{self.__class__.__name__}({fields!r})"
 
     def __init__(self, linkifyit, shift):
         start = linkifyit._index
@@ -58,9 +375,965 @@ class Match:
         self.schema = linkifyit._schema.lower()
         self.index = start + shift
         self.last_index = end + shift
-        self.raw = text
+        self._source = None
+        self._raw = text
+        self._text = text
+        self._url = text
+        self._normalize = None
+
+    @classmethod
+    def _from_scan(cls, text, schema, index, last_index, normalize):
+        """Create match from scan result, without LinkifyIt scan state.
+
+        ``normalize`` is called with the match on first ``text`` / ``url`` use.
+        """
+        match = cls.__new__(cls)
+
+        match.schema = schema.lower()
+        match.index = index
+        match.last_index = last_index
+        match._source = text
+        match._raw = None
+        match._text = None
+        match._url = None
+        match._normalize = normalize
+        return match
+
+    def __getstate__(self):
+        return (self.schema, self.index, self.last_index, self.raw, self.text, self.url)
+
+    def __setstate__(self, state):
+        self.schema, self.index, self.last_index, self._raw, self._text, self._url = (
+            state
+        )
+        self._source = None
+        self._normalize = None
+
+    def _run_normalize(self):
+        normalize = self._normalize
+        # Reset first: normalizer reads & writes `text` / `url`
+        self._normalize = None
+        self._text = self._url = self.raw
+        normalize(self)
+
+    @property
+    def raw(self):
+        if self._raw is None:
+            self._raw = self._source[self.index : self.last_index]
+            self._source = None
+        return self._raw
+
+    @raw.setter
+    def raw(self, value):
+        self._raw = value
+        self._source = None
+
+    @property
+    def text(self):
+        if self._normalize is not None:
+            self._run_normalize()
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        if self._normalize is not None:
+            self._run_normalize()
+        self._text = value
+
+    @property
+    def url(self):
+        if self._normalize is not None:
+            self._run_normalize()
+        return self._url
+
+    @url.setter
+    def url(self, value):
+        if self._normalize is not None:
+            self._run_normalize()
+        self._url = value
+
+
+# Groups of pattern sources, and configuration parts each one is built from,
+# in build order. A group is rebuilt only when one of its parts changes (later
+# groups read sources of earlier ones, so they list their parts too).
+#
+# - options: ``---`` option
+# - tlds: tlds list
+# - schemas: schema names
+_PATTERN_DEPS = {
+    "base": ("options",),
+    "fuzzy": ("options", "tlds"),
+    "schema": ("options", "tlds", "schemas"),
+}
+
+
+class _PatternSet:
+    """Pattern sources of one configuration, and their compiled patterns.
+
+    Sources don't change after creation. Compiled patterns are added lazily, on
+    first use. Linkifiers with identical configuration share one pattern set,
+    see :class:`PatternCache`.
+
+    A set built from another one (``base``) takes over compiled patterns with
+    unchanged sources, so a configuration change recompiles only the patterns
+    it affects.
+
+    Patterns are compiled by regex engine of the configuration (see
+    :mod:`linkify_it.engines`).
+
+    Args:
+        re (dict): pattern sources
+        key (dict): Optional. Configuration part -> its value, see
+            ``_PATTERN_DEPS``, and ``engine`` -> :class:`Engine`
+        base (:class:`_PatternSet`): Optional. Set to take compiled patterns
+            from
+    """
+
+    def __init__(self, re, key=None, base=None):
+        self.re = re
+        self.key = key
+        self.engine = key["engine"] if key else get_engine()
+        self.patterns = {}
+        self.compiles = 0
+
+        if base is not None and base.engine is self.engine:
+            # Copy at once, other threads can add patterns to `base` meanwhile
+            for name, pattern in dict(base.patterns).items():
+                src_name = name[0] if isinstance(name, tuple) else name
+                if re.get(src_name) == base.re.get(src_name):
+                    self.patterns[name] = pattern
+
+    def pattern(self, name, ascii=False):
+        """Return compiled ``self.re[name]``, compiling it on first use.
+
+        Args:
+            name (str): key in ``self.re``
+            ascii (bool): Optional. Return variant for ASCII texts, with
+                Unicode classes restricted to ASCII (see ``ucre.ascii_src``)
+
+        Returns:
+            compiled pattern (case insensitive), ``re.Pattern`` by default
+        """
+        key = (name, "ascii") if ascii else name
+        pattern = self.patterns.get(key)
+        if pattern is None:
+            src = ascii_src(self.re[name]) if ascii else self.re[name]
+            pattern = self.engine.compile(src, ascii)
+            self.patterns[key] = pattern
+            self.compiles += 1
+        return pattern
+
+    def at_start_pattern(self, name, ascii=False):
+        """Return compiled :func:`_at_start_variant` of ``self.re[name]``, or
+        ``None`` if pattern has no leading ``(^|...)`` group.
+        """
+        key = (name, "at_start", "ascii") if ascii else (name, "at_start")
+        if key not in self.patterns:
+            src = _at_start_variant(self.re[name])
+            if src is None:
+                self.patterns[key] = None
+            else:
+                if ascii:
+                    src = ascii_src(src)
+                self.patterns[key] = self.engine.compile(src, ascii)
+                self.compiles += 1
+        return self.patterns[key]
+
+    def size(self):
+        """Approximate memory used by sources and compiled patterns, in bytes."""
+        sources = list(self.re.values())
+        patterns = list(self.patterns.values())
+        return sum(sys.getsizeof(src) for src in sources) + sum(
+            sys.getsizeof(pattern) for pattern in patterns if pattern is not None
+        )
+
+
+class PatternCache:
+    """Process-wide LRU cache of compiled pattern sets, keyed by configuration.
+
+    Linkifiers with the same ``---`` option, schema names and tlds share one
+    set of patterns, so creating them costs a dictionary lookup, and patterns
+    are compiled once per process. When approximate memory of cached sets
+    exceeds ``max_bytes``, least recently used sets are dropped (linkifiers
+    keep using sets they already have).
+
+    Args:
+        max_bytes (int): memory budget. 64 MiB by default, ``0`` disables cache.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._sets = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sets)
+
+    def get(self, key, build):
+        """Return pattern set for ``key``, building it with ``build()`` if not
+        cached.
+
+        Args:
+            key (tuple): configuration key
+            build (callable): returns new :class:`_PatternSet`
+
+        Returns:
+            :class:`_PatternSet`
+        """
+        with self._lock:
+            patterns = self._sets.get(key)
+            if patterns is not None:
+                self._sets.move_to_end(key)
+                self.hits += 1
+                return patterns
+            self.misses += 1
+
+        patterns = build()
+
+        if self.max_bytes <= 0:
+            return patterns
+
+        with self._lock:
+            # Other thread could build the same set meanwhile, keep one
+            patterns = self._sets.setdefault(key, patterns)
+            self._sets.move_to_end(key)
+            self._evict()
+
+        return patterns
+
+    def _evict(self):
+        sizes = {key: patterns.size() for key, patterns in self._sets.items()}
+        total = sum(sizes.values())
+
+        # Keep at least the most recent set
+        while total > self.max_bytes and len(self._sets) > 1:
+            key, _ = self._sets.popitem(last=False)
+            total -= sizes[key]
+
+    def clear(self):
+        """Drop all cached pattern sets."""
+        with self._lock:
+            self._sets.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Pattern sets shared by all LinkifyIt instances of the process
+PATTERN_CACHE = PatternCache()
+
+
+class SourceCache:
+    """Optional on-disk cache of pattern sources, for fast process starts.
+
+    Building pattern sources of a configuration costs time in every new
+    process. With ``directory`` set, sources are saved there, one file per
+    configuration, named by a hash of python, library and ``uc_micro``
+    versions and the configuration (``---`` option, tlds, schema names). Other processes
+    load them instead of building. Entries which can't be read or don't match
+    their configuration are built again and rewritten.
+
+    Compiled regexps can't be stored, they are still compiled on first use.
+    Loaded sources are compiled as is, so the directory should be writable
+    only by trusted users.
+
+    Args:
+        directory (str): Optional. Cache directory, created on first save.
+            ``None`` disables cache.
+    """
+
+    # Version of file format
+    FORMAT = 2
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def _meta(self, config):
+        import json
+
+        import uc_micro
+
+        from . import __version__
+
+        meta = {
+            "format": self.FORMAT,
+            "linkify_it": __version__,
+            "uc_micro": getattr(uc_micro, "__version__", None),
+            "python": sys.implementation.cache_tag,
+            "config": config,
+        }
+        # Normalize tuples to lists, as loaded from file
+        return json.loads(json.dumps(meta))
+
+    def path(self, config):
+        """Cache file of configuration.
+
+        Args:
+            config (dict): configuration part -> its value, see ``_PATTERN_DEPS``
+
+        Returns:
+            str: file path
+        """
+        import hashlib
+        import json
+
+        digest = hashlib.sha256(
+            json.dumps(self._meta(config), sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        return os.path.join(self.directory, "linkify-it-" + digest + ".cache")
+
+    def load(self, config):
+        """Load saved sources of configuration.
+
+        Args:
+            config (dict): configuration part -> its value
+
+        Returns:
+            dict: pattern sources, ``None`` if not cached or entry is broken
+        """
+        if not self.directory:
+            return None
+
+        # Imported here, to keep `import linkify_it` fast
+        import hashlib
+        import json
+
+        try:
+            with open(self.path(config), "rb") as f:
+                header, body = f.read().split(b"\n", 1)
+            header = json.loads(header)
+            valid = (
+                header["meta"] == self._meta(config)
+                and header["checksum"] == hashlib.sha256(body).hexdigest()
+            )
+            if valid:
+                data = json.loads(body)
+                sources, classes = data["re"], data["ascii_classes"]
+                valid = all(isinstance(src, str) for src in sources.values()) and all(
+                    isinstance(src, str) for item in classes.items() for src in item
+                )
+            if valid:
+                add_ascii_classes(classes)
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            valid = False
+
+        if not valid:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return sources
+
+    def save(self, config, sources):
+        """Save sources of configuration. Errors are ignored, cache is only
+        an optimization.
+
+        Args:
+            config (dict): configuration part -> its value
+            sources (dict): pattern sources
+        """
+        if not self.directory:
+            return
+
+        import hashlib
+        import json
+
+        # JSON header line, then JSON sources. Header checksum detects broken
+        # files.
+        body = json.dumps(
+            {"re": sources, "ascii_classes": ascii_classes(sources.values())}
+        ).encode("utf-8")
+        header = json.dumps(
+            {"meta": self._meta(config), "checksum": hashlib.sha256(body).hexdigest()}
+        ).encode("utf-8")
+        path = self.path(config)
+        tmp = "{}.{}.tmp".format(path, os.getpid())
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp, "wb") as f:
+                f.write(header + b"\n" + body)
+            # Readers never see partially written files
+            os.replace(tmp, path)
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.remove(tmp)
+
+    def clear(self):
+        """Remove all cache files."""
+        self.hits = 0
+        self.misses = 0
+        if not self.directory or not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.startswith("linkify-it-") and name.endswith(".cache"):
+                with contextlib.suppress(OSError):
+                    os.remove(os.path.join(self.directory, name))
+
+
+# Pattern sources saved between processes. Off, unless LINKIFY_IT_CACHE_DIR
+# environment variable is set.
+SOURCE_CACHE = SourceCache(os.environ.get("LINKIFY_IT_CACHE_DIR") or None)
+
+
+class _Core:
+    """Compiled state of :class:`LinkifyIt`.
+
+    Holds pattern sources, compiled patterns and schema handlers built by one
+    ``_compile()`` call. Recompiling creates a new core and swaps it in one
+    assignment, so scans already running in other threads keep a consistent
+    view.
+
+    Args:
+        re (dict): pattern sources (``LinkifyIt.re``)
+        compiled (dict): schema name -> ``validate`` / ``normalize`` handlers
+        patterns (:class:`_PatternSet`): compiled patterns, can be shared with
+            other linkifiers
+        tlds (frozenset): Optional. Allowed tlds (case folded) in ``tld_set``
+            mode, ``None`` if tlds are checked by patterns.
+        tlds_re (re.Pattern): Optional. Tlds with regexp syntax, which can't be
+            checked with ``tlds`` set lookup.
+        triggers (tuple): Optional. :func:`_link_triggers` result, ``None``
+            disables prefilter.
+    """
+
+    def __init__(self, re, compiled, patterns, tlds=None, tlds_re=None, triggers=None):
+        self.re = re
+        self.compiled = compiled
+        self.patterns = patterns
+        self.tlds = tlds
+        self.tlds_re = tlds_re
+        self.triggers = triggers
+        self._anchors = None
+
+    def anchors(self):
+        """:class:`_Anchors` of this state, built on first use. ``None`` if
+        patterns are changed by ``_on_compile`` hook (prefilter is off then).
+        """
+        if self.triggers is None:
+            return None
+        if self._anchors is None:
+            self._anchors = _Anchors(self)
+        return self._anchors
+
+    def may_have_link(self, text):
+        """Quick check without regexps. ``False`` if ``text`` has no links for
+        sure, ``True`` if it can have.
+        """
+        if self.triggers is None:
+            return True
+
+        plain, folded = self.triggers
+        for trigger in plain:
+            if trigger in text:
+                return True
+
+        text = _fold(text)
+        for trigger in folded:
+            if trigger in text:
+                return True
+
+        return False
+
+    def pattern(self, name, ascii=False):
+        return self.patterns.pattern(name, ascii)
+
+    def at_start_pattern(self, name, ascii=False):
+        return self.patterns.at_start_pattern(name, ascii)
+
+    def valid_tld(self, matched):
+        """Check root zone, captured by ``tld`` group of fuzzy pattern match.
+
+        Always ``True`` if tlds are checked by patterns, or if matched host has
+        no root zone (IP, localhost).
+        """
+        if self.tlds is None:
+            return True
+
+        tld = matched.group("tld")
+        if tld is None:
+            return True
+
+        tld = _fold(tld)
+        if tld in self.tlds or tld.startswith("xn--"):
+            return True
+        return self.tlds_re is not None and bool(self.tlds_re.match(tld))
+
+    def with_valid_tld(self, pattern, matched):
+        """Check root zone of ``pattern`` match (see :meth:`valid_tld`).
+
+        Patterns match the longest host with any root zone. Shorter hosts
+        can't end inside it (next char is ``.`` or ``-``), except before
+        ``---`` with ``---`` option. Then, if the root zone is unknown, those
+        shorter hosts are tried too, as alternation of known zones would do.
+
+        Returns:
+            re.Match: ``matched``, longest match with shorter host and known
+            root zone at the same start, or ``None``
+        """
+        if matched is None or self.valid_tld(matched):
+            return matched
+        if not self.patterns.key["options"]:
+            return None
+
+        text, start = matched.string, matched.start(0)
+        end = text.rfind("---", start, matched.start("tld") + 2)
+        while end > start:
+            shorter = pattern.match(text, start, end)
+            if shorter and shorter.end(0) == end and self.valid_tld(shorter):
+                return shorter
+            end = text.rfind("---", start, end + 2)
+
+        return None
+
+    def search(self, name, text, pos):
+        """Search ``name`` pattern from ``pos``, skipping matches with unknown
+        root zone (see :meth:`with_valid_tld`).
+
+        Returns:
+            re.Match or ``None``
+        """
+        pattern = self.pattern(name, text.isascii())
+        matched = pattern.search(text, pos)
+
+        while matched:
+            valid = self.with_valid_tld(pattern, matched)
+            if valid:
+                return valid
+            # Other hosts can start right after the rejected match start
+            matched = pattern.search(text, matched.start(0) + 1)
+
+        return None
+
+
+class _CharClass:
+    """Membership test of single chars in regexp ``src``, memoized per char.
+
+    Args:
+        src (str): regexp matching one char (case insensitive)
+    """
+
+    # Limit of memoized chars
+    MAX_KNOWN = 4096
+
+    def __init__(self, src):
+        self._re = re.compile("(?:" + src + ")", flags=re.IGNORECASE)
+        self._known = {}
+
+    def __contains__(self, char):
+        found = self._known.get(char)
+        if found is None:
+            found = self._re.fullmatch(char) is not None
+            if len(self._known) < self.MAX_KNOWN:
+                self._known[char] = found
+        return found
+
+
+class _Anchors:
+    """Anchor finders of :class:`_AnchorScanner` for one compiled state.
+
+    Every link contains an anchor: last char of schema name, ``.`` of the host
+    or ``@`` of an email. Each pattern can start only at a few positions
+    around an anchor, :meth:`candidates` lists them in increasing order.
+
+    Args:
+        core (:class:`_Core`): compiled state
+    """
+
+    # Max length of the first host label, and of the prefix before it
+    LABEL_MAX = 63 + 2
+
+    def __init__(self, core):
+        offsets = {}
+        ends = set()
+        for name, val in core.compiled.items():
+            if not name or not val:
+                continue
+            # Prefix char (one or two code points) before name, or `^`
+            size = len(name)
+            offsets.setdefault(_fold(name[-1]), set()).update(
+                (-size - 1, -size, 1 - size)
+            )
+            ends.add(_escape_re(name[-1]))
+
+        self.schema = (
+            re.compile("|".join(sorted(ends)), flags=re.IGNORECASE) if ends else None,
+            {char: tuple(sorted(found)) for char, found in offsets.items()},
+        )
+
+        # `www.`, `.tld` or `.123.` start at (or 3 chars before) a dot
+        self.host_test = (
+            re.compile(r"\.|localhost", flags=re.IGNORECASE),
+            {".": (-3, 0), "localhost": (0,)},
+        )
+
+        self.label_chars = _CharClass(core.re["src_pseudo_letter"] + "|-")
+        self.link_symbol = re.compile(core.re["src_link_symbols"], flags=re.IGNORECASE)
+        self.email_chars = _CharClass(core.re["src_email_name_char"])
+
+    @staticmethod
+    def _run_start(text, end, limit, chars):
+        """Start of the run of ``chars`` ending at ``end``, not before ``limit``."""
+        start = end
+        while start > limit and text[start - 1] in chars:
+            start -= 1
+        return start
+
+    def candidates(self, name, text, pos):
+        """Positions from ``pos``, where ``name`` pattern can start.
+
+        Can repeat or include positions, where pattern doesn't match.
+        """
+        if name == "schema_search":
+            if self.schema[0] is None:
+                return iter(())
+            return self._offsets(text, pos, *self.schema)
+        if name == "host_fuzzy_test":
+            return self._offsets(text, pos, *self.host_test)
+        if name in ("link_fuzzy", "link_no_ip_fuzzy"):
+            return self._hosts(text, pos)
+        if name == "email_fuzzy":
+            return self._emails(text, pos)
+        raise KeyError(name)
+
+    @staticmethod
+    def _offsets(text, pos, anchor_re, offsets):
+        """Candidates at fixed offsets (``<= 0``) from anchors."""
+        low = min(min(found) for found in offsets.values())
+        heap = []
+
+        for matched in anchor_re.finditer(text, pos):
+            anchor = matched.start(0)
+            # Next anchors give candidates from `anchor + low + 1` on
+            while heap and heap[0] <= anchor + low:
+                yield heapq.heappop(heap)
+
+            found = matched.group(0)
+            for offset in offsets.get(found) or offsets[_fold(found)]:
+                if anchor + offset >= pos:
+                    heapq.heappush(heap, anchor + offset)
+
+        while heap:
+            yield heapq.heappop(heap)
+
+    def _hosts(self, text, pos):
+        """Candidates of fuzzy links: prefix before the first host label.
+
+        Link starts right before the label run ending at a dot (or at the run
+        itself, with ``^``), or at a symbol inside the run, which is both a
+        label char and a link prefix (``|``, ``$``, ...).
+        """
+        dot = text.find(".", pos)
+        while dot >= 0:
+            start = self._run_start(
+                text, dot, max(pos, dot - self.LABEL_MAX), self.label_chars
+            )
+            for candidate in (start - 2, start - 1, start):
+                if candidate >= pos:
+                    yield candidate
+            for matched in self.link_symbol.finditer(text, start, dot):
+                yield matched.start(0)
+            dot = text.find(".", dot + 1)
+
+    def _emails(self, text, pos):
+        """Candidates of fuzzy emails: prefix before the name run ending at
+        ``@``, and quotes inside the run (quote is both a name char and a
+        prefix).
+        """
+        at = text.find("@", pos)
+        while at >= 0:
+            start = self._run_start(text, at, pos, self.email_chars)
+            if start > pos:
+                yield start - 1
+            yield start
+
+            quote = text.find('"', start + 1, at)
+            while quote >= 0:
+                yield quote
+                quote = text.find('"', quote + 1, at)
+
+            at = text.find("@", at + 1)
+
+
+class _Scanner:
+    """Incremental link scanner over one text.
+
+    Keeps a cursor and the next candidate of each kind (schema link, fuzzy link,
+    fuzzy email). A kind is searched again only when the cursor passes its
+    cached candidate, so scanning the whole text is linear in its length.
+    Found links are the same as calling :meth:`LinkifyIt.test` on consecutive
+    text tails.
+
+    Scan state lives here, not in LinkifyIt, so one linkifier can be used by
+    many scans at once (nested or from several threads).
+
+    Args:
+        linkifyit (:class:`linkify_it.main.LinkifyIt`) LinkifyIt object
+        text (str): text to scan
+        core (:class:`_Core`): Optional. Compiled state to use, current one of
+            ``linkifyit`` by default.
+    """
+
+    def __init__(self, linkifyit, text, core=None):
+        self.linkifyit = linkifyit
+        self.core = core or linkifyit._core
         self.text = text
-        self.url = text
+        self.pos = 0 if self.core.may_have_link(text) else len(text)
+        # ASCII texts are scanned with ASCII variants of patterns
+        self.ascii = text.isascii()
+
+        # kind -> (cursor, valid until position, result)
+        self._cache = {}
+
+    def _cached(self, kind, at_start):
+        """Cached result of ``kind`` if it is still valid for the cursor, else
+        ``_MISS``.
+        """
+        cached = self._cache.get(kind)
+        if cached is None:
+            return _MISS
+
+        pos, valid_until, result = cached
+        if self.pos == pos:
+            return result
+        if self.pos > valid_until:
+            return _MISS
+        if at_start is not None and at_start.match(self.text, self.pos):
+            # New cursor position can start a link, see `_at_start_variant`
+            return _MISS
+        return result
+
+    def _finditer(self, name, at_start):
+        """Iterate matches of ``name`` pattern as in the tail from the cursor."""
+        pos = self.pos
+        if pos and at_start is not None:
+            matched = at_start.match(self.text, pos)
+            if matched:
+                yield matched
+                pos = matched.end(0)
+
+        yield from self.core.pattern(name, self.ascii).finditer(self.text, pos)
+
+    def _search(self, name, at_start):
+        """First match of ``name`` fuzzy pattern as in the tail from the cursor,
+        with known root zone. ``at_start`` is ``None`` for patterns without
+        leading ``(^|...)`` group.
+        """
+        if self.pos and at_start is not None:
+            matched = at_start.match(self.text, self.pos)
+            matched = self.core.with_valid_tld(at_start, matched)
+            if matched:
+                return matched
+
+        return self.core.search(name, self.text, self.pos)
+
+    def _schema_link(self):
+        compiled = self.core.compiled
+        text = self.text
+        at_start = self.core.at_start_pattern("schema_search", self.ascii)
+
+        result = self._cached("schema", at_start)
+        if result is not _MISS:
+            return result
+
+        result = None
+        valid_until = len(text)
+
+        for matched in self._finditer("schema_search", at_start):
+            # Search from any position up to the first hit gives the same hits
+            valid_until = min(valid_until, matched.start(0))
+
+            last_index = matched.end(0)
+            m = (matched.group(), matched.groups()[0], matched.groups()[1])
+            schema = compiled.get(m[2].lower())
+            length = schema["validate"](text, last_index) if schema else 0
+            if length:
+                result = (
+                    m[2],
+                    matched.start(0) + len(m[1]),
+                    matched.start(0) + len(m[0]) + length,
+                )
+                break
+
+        self._cache["schema"] = (self.pos, valid_until, result)
+        return result
+
+    def _tld_pos(self):
+        result = self._cached("tld", None)
+        if result is not _MISS:
+            return result
+
+        matched_tld = self._search("host_fuzzy_test", None)
+        if matched_tld:
+            result = matched_tld.start(0)
+            valid_until = result
+        else:
+            result = -1
+            valid_until = len(self.text)
+
+        self._cache["tld"] = (self.pos, valid_until, result)
+        return result
+
+    def _fuzzy(self, kind, name):
+        at_start = self.core.at_start_pattern(name, self.ascii)
+
+        result = self._cached(kind, at_start)
+        if result is not _MISS:
+            return result
+
+        matched = self._search(name, at_start)
+        if matched:
+            result = (matched.start(0) + len(matched.groups()[0]), matched.end(0))
+            valid_until = matched.start(0)
+        else:
+            result = None
+            valid_until = len(self.text)
+
+        self._cache[kind] = (self.pos, valid_until, result)
+        return result
+
+    def _fuzzy_email(self):
+        if self.text.find("@", self.pos) < 0:
+            return None
+
+        # We can't skip this check, because this cases are possible:
+        # 192.168.1.1@gmail.com, my.in@example.com
+        return self._fuzzy("email", "email_fuzzy")
+
+    def scan(self):
+        """Find next link from the cursor, and move the cursor after it.
+
+        Returns:
+            ``tuple`` or ``None``: (schema, index, last_index) of found link
+        """
+        opts = self.linkifyit._opts
+        compiled = self.core.compiled
+
+        if self.pos >= len(self.text):
+            return None
+
+        schema = ""
+        index = -1
+        last_index = -1
+
+        found = self._schema_link()
+        if found:
+            schema, index, last_index = found
+
+        if opts.get("fuzzy_link") and compiled.get("http:"):
+            # guess schemaless links
+            tld_pos = self._tld_pos()
+            # if tld is located after found link - no need to check fuzzy pattern
+            if tld_pos >= 0 and (index < 0 or tld_pos < index):
+                if opts.get("fuzzy_ip"):
+                    found = self._fuzzy("link", "link_fuzzy")
+                else:
+                    found = self._fuzzy("link_no_ip", "link_no_ip_fuzzy")
+
+                if found and (index < 0 or found[0] < index):
+                    schema = ""
+                    index, last_index = found
+
+        if opts.get("fuzzy_email") and compiled.get("mailto:"):
+            # guess schemaless emails
+            found = self._fuzzy_email()
+            if found:
+                shift, next_shift = found
+                if (
+                    index < 0
+                    or shift < index
+                    or (shift == index and next_shift > last_index)
+                ):
+                    schema = "mailto:"
+                    index = shift
+                    last_index = next_shift
+
+        if index < 0:
+            self.pos = len(self.text)
+            return None
+
+        self.pos = last_index
+        return schema, index, last_index
+
+
+class _AnchorScanner(_Scanner):
+    """Scanner, which runs patterns only around anchors.
+
+    Instead of searching the whole text with big patterns, finds anchors
+    cheaply (``str.find`` or small regexps, see :class:`_Anchors`) and
+    matches patterns in place at positions around them. Tried positions
+    include all, where a pattern can start, in increasing order, so found links
+    are the same as with :class:`_Scanner`.
+    """
+
+    def _candidates(self, name, pos):
+        last = -1
+        for candidate in self.core.anchors().candidates(name, self.text, pos):
+            if candidate > last:
+                last = candidate
+                yield candidate
+
+    def _finditer(self, name, at_start):
+        if self.core.anchors() is None:
+            yield from super()._finditer(name, at_start)
+            return
+
+        pos = self.pos
+        if pos and at_start is not None:
+            matched = at_start.match(self.text, pos)
+            if matched:
+                yield matched
+                pos = matched.end(0)
+
+        pattern = self.core.pattern(name, self.ascii)
+        for candidate in self._candidates(name, pos):
+            if candidate < pos:
+                continue
+            matched = pattern.match(self.text, candidate)
+            if matched:
+                yield matched
+                pos = matched.end(0)
+
+    def _search(self, name, at_start):
+        if self.core.anchors() is None:
+            return super()._search(name, at_start)
+
+        core = self.core
+        if self.pos and at_start is not None:
+            matched = core.with_valid_tld(at_start, at_start.match(self.text, self.pos))
+            if matched:
+                return matched
+
+        pattern = core.pattern(name, self.ascii)
+        for candidate in self._candidates(name, self.pos):
+            matched = core.with_valid_tld(pattern, pattern.match(self.text, candidate))
+            if matched:
+                return matched
+
+        return None
+
+
+# Values of `scanner` option
+_SCANNERS = {"regex": _Scanner, "anchor": _AnchorScanner}
+
+
+def _get_scanner(name=None):
+    """Return scanner class by ``scanner`` option value, ``regex`` by default.
+
+    Raises:
+        ValueError: if scanner is unknown
+    """
+    scanner = _SCANNERS.get(name or "regex")
+    if scanner is None:
+        raise ValueError(
+            "Unknown scanner {!r}, expected one of: {}".format(
+                name, ", ".join(sorted(_SCANNERS))
+            )
+        )
+    return scanner
 
 
 class LinkifyIt:
@@ -86,6 +1359,10 @@ class LinkifyIt:
           include the link prefix itself), or a validator ``function`` which, given
           arguments *self*, *text* and *pos* returns the length of a match in *text*
           starting at index *pos*. *pos* is the index right after the link prefix.
+          Patterns starting with ``^`` are matched in place, with
+          ``pattern.match(text, pos)``. Validator functions receive the whole
+          text, and should do the same instead of slicing ``text[pos:]``, to keep
+          the cost of a check independent of the text length.
         - *normalize* - optional function to normalize text & url of matched
           result (for example, for @twitter mentions).
 
@@ -97,6 +1374,13 @@ class LinkifyIt:
     - **fuzzyEmail** - recognize emails without ``mailto:`` prefix.
     - **---** - set `True` to terminate link with `---` (if it's considered as long
       dash).
+    - **scanner** - ``"regex"`` (default) searches the text with whole
+      patterns, ``"anchor"`` finds anchors (schema name ends, ``.``, ``@``)
+      first, and matches patterns only around them. Both find the same links.
+    - **tld_set** - set `True` to check root zones of fuzzy links with a set
+      lookup after match, instead of tlds alternation inside patterns. Patterns
+      don't depend on tlds then: ``tlds()`` needs no recompile, and long lists
+      cost the same as short ones. Default ``False``.
 
     Args:
         schemas (dict): Optional. Additional schemas to validate (prefix/validator)
@@ -104,44 +1388,15 @@ class LinkifyIt:
             Default: {"fuzzy_link": True, "fuzzy_email": True, "fuzzy_ip": False}.
     """
 
-    def _validate_http(self, text, pos):
-        tail = text[pos:]
-        if not self.re.get("http"):
-            # compile lazily, because "host"-containing variables can change on
-            # tlds update.
-            self.re["http"] = (
-                "^\\/\\/"
-                + self.re["src_auth"]
-                + self.re["src_host_port_strict"]
-                + self.re["src_path"]
-            )
-
-        founds = re.search(self.re["http"], tail, flags=re.IGNORECASE)
-        if founds:
-            return len(founds.group())
-
-        return 0
-
-    def _validate_double_slash(self, text, pos):
-        tail = text[pos:]
-
-        if not self.re.get("not_http"):
-            # compile lazily, because "host"-containing variables can change on
-            # tlds update.
-            self.re["not_http"] = (
-                "^"
-                + self.re["src_auth"]
-                + "(?:localhost|(?:(?:"
-                + self.re["src_domain"]
-                + ")\\.)+"
-                + self.re["src_domain_root"]
-                + ")"
-                + self.re["src_port"]
-                + self.re["src_host_terminator"]
-                + self.re["src_path"]
-            )
-
-        founds = re.search(self.re["not_http"], tail, flags=re.IGNORECASE)
+    def _validate_http(self, text, pos):
+        founds = self._core.pattern("http", text.isascii()).match(text, pos)
+        if founds:
+            return len(founds.group())
+
+        return 0
+
+    def _validate_double_slash(self, text, pos):
+        founds = self._core.pattern("not_http", text.isascii()).match(text, pos)
         if founds:
             if pos >= 3 and text[pos - 3] == ":":
                 return 0
@@ -154,31 +1409,66 @@ class LinkifyIt:
         return 0
 
     def _validate_mailto(self, text, pos):
-        tail = text[pos:]
-
-        if not self.re.get("mailto"):
-            self.re["mailto"] = (
-                "^" + self.re["src_email_name"] + "@" + self.re["src_host_strict"]
-            )
-
-        founds = re.search(self.re["mailto"], tail, flags=re.IGNORECASE)
+        founds = self._core.pattern("mailto", text.isascii()).match(text, pos)
         if founds:
             return len(founds.group(0))
 
         return 0
 
     def _reset_scan_cache(self):
-        self._index = -1
-        self._text_cache = ""
+        self._local.scan = None
+
+    def _last_scan(self):
+        """Last ``test()`` result of current thread: (core, text, found)."""
+        return getattr(self._local, "scan", None) or _NO_SCAN
+
+    # Last scan result, as separate values (read only). Kept for
+    # `Match(linkifyit, shift)` and subclasses.
+    _text_cache = property(lambda self: self._last_scan()[1])
+    _schema = property(lambda self: self._last_scan()[2][0])
+    _index = property(lambda self: self._last_scan()[2][1])
+    _last_index = property(lambda self: self._last_scan()[2][2])
+
+    @property
+    def pattern_compiles(self):
+        """int: Number of regexps compiled for current configuration so far.
+
+        Stays constant once all used patterns are warmed up, can be used to
+        check that nothing is recompiled on the hot path. Counts compiles of
+        the pattern set shared with identically configured instances.
+        """
+        return self._core.patterns.compiles
+
+    @property
+    def engine(self):
+        """:class:`linkify_it.engines.Engine`: Regex engine, which compiles
+        patterns. ``re`` if engine set by ``engine`` option is not installed.
+        """
+        return self._core.patterns.engine
 
     def _create_validator(self, regex):
+        if isinstance(regex, str):
+            regex = re.compile(regex, flags=re.IGNORECASE)
+
+        anchored = _anchored_variant(regex)
+        if anchored is not None:
+            # Leading ``^`` anchors the rule right after the link prefix. Drop it
+            # and match in place, without copying the text tail.
+
+            def func(text, pos):
+                founds = anchored.match(text, pos)
+
+                if founds:
+                    return len(founds.group(0))
+
+                return 0
+
+            return func
+
         def func(text, pos):
+            # Not anchored rule: search anywhere in the tail, as before.
             tail = text[pos:]
-            if isinstance(regex, str):
-                founds = re.search(regex, tail, flags=re.IGNORECASE)
-            else:
-                # re.Pattern
-                founds = re.search(regex, tail)
+            founds = regex.search(tail)
 
             if founds:
                 return len(founds.group(0))
@@ -193,10 +1483,12 @@ class LinkifyIt:
 
         return func
 
-    def _create_match(self, shift):
-        match = Match(self, shift)
-        self._compiled[match.schema]["normalize"](match)
-        return match
+    def _create_scanner(self, text, core=None):
+        return _get_scanner(self._opts.get("scanner"))(self, text, core)
+
+    def _create_match(self, core, text, found):
+        normalize = core.compiled[found[0].lower()]["normalize"]
+        return Match._from_scan(text, *found, normalize)
 
     def __init__(self, schemas=None, options=None):
         self.default_options = {
@@ -227,11 +1519,9 @@ class LinkifyIt:
         else:
             self._opts = self.default_options
 
-        # Cache last tested result. Used to skip repeating steps on next `match` call.
-        self._index = -1
-        self._last_index = -1  # Next scan position
-        self._schema = ""
-        self._text_cache = ""
+        # Cache last tested result (per thread). Used to skip repeating steps on
+        # next `match` call.
+        self._local = threading.local()
 
         if schemas:
             self.default_schemas.update(schemas)
@@ -244,37 +1534,211 @@ class LinkifyIt:
         self._tlds = self.tlds_default
         self._tlds_replaced = False
 
-        self.re = {}
+        self._re = {}
+        self._current_core = _Core(self._re, self._compiled, _PatternSet(self._re))
+
+        # Configuration parts changed since last compile (see `_PATTERN_DEPS`),
+        # and depth of `configure()` blocks
+        self._changed = set(_PATTERN_DEPS["schema"])
+        self._batch = 0
+
+        # Serializes compilation between threads, which make first scans at
+        # once. Reentrant: pattern builders read `re` while compiling.
+        self._compile_lock = threading.RLock()
+        self._compiling = False
+
+        # Check schemas, scanner & engine now, so errors point to the
+        # constructor. Patterns are built on first use.
+        _get_scanner(self._opts.get("scanner"))
+        get_engine(self._opts.get("engine"))
+        self._compile_schemas()
+        self._changed.discard("schemas")
+
+    @property
+    def re(self):
+        """dict: Pattern sources of current configuration."""
+        if self._changed:
+            self._ensure_compiled()
+        return self._re
+
+    @re.setter
+    def re(self, value):
+        self._re = value
+
+    @property
+    def _core(self):
+        if self._changed:
+            self._ensure_compiled()
+        return self._current_core
+
+    def _ensure_compiled(self):
+        # `_changed` is cleared only after new core is published, so threads
+        # which see it empty can use `_current_core` without the lock
+        with self._compile_lock:
+            if self._changed and not self._compiling:
+                self._compiling = True
+                try:
+                    self._compile()
+                finally:
+                    self._compiling = False
+
+    def _invalidate(self, *parts):
+        # Compile on next use, or at the end of `configure()` block
+        self._changed.update(parts)
+
+    @contextlib.contextmanager
+    def configure(self):
+        """Context manager to change configuration in one step.
+
+        ``add()``, ``tlds()`` and ``set()`` don't compile by themselves, the
+        linkifier is compiled on first use after changes. Changes made inside
+        the block are compiled once, on exit, so the first scan doesn't pay for
+        it.
+
+        .. code-block:: python
+
+            with linkifyit.configure() as config:
+                config.add("git:", "http:").add("ssh:", "http:")
+                config.tlds(["onion", "i2p"], True)
+
+        Returns:
+            :class:`linkify_it.main.LinkifyIt`
+        """
+        self._batch += 1
+        try:
+            yield self
+        finally:
+            self._batch -= 1
+
+        if not self._batch and self._changed:
+            self._ensure_compiled()
+
+    def _compile_schema(self, name, val):
+        """Create handlers of schema definition.
+
+        Args:
+            name (str): schema name
+            val (dict or str): schema definition
+
+        Raises:
+            SchemaError: if definition is invalid
+
+        Returns:
+            dict: ``validate`` and ``normalize`` handlers, or ``None`` for alias
+        """
+        if isinstance(val, str):
+            return None
+
+        if not isinstance(val, dict):
+            raise SchemaError(name, val)
 
-        self._compile()
+        compiled = {"validate": None, "link": None}
+
+        if isinstance(val.get("validate"), RE_TYPE):
+            compiled["validate"] = self._create_validator(val.get("validate"))
+        elif isinstance(val.get("validate"), str):
+            compiled["validate"] = self._create_validator(val.get("validate"))
+        elif isinstance(val.get("validate"), types.MethodType):
+            compiled["validate"] = val.get("validate")
+        # Add custom handler, bound to this instance
+        elif isinstance(val.get("validate"), types.FunctionType):
+            compiled["validate"] = types.MethodType(val.get("validate"), self)
+        else:
+            raise SchemaError(name, val)
+
+        if isinstance(val.get("normalize"), types.MethodType):
+            compiled["normalize"] = val.get("normalize")
+        # Add custom handler, bound to this instance
+        elif isinstance(val.get("normalize"), types.FunctionType):
+            compiled["normalize"] = types.MethodType(val.get("normalize"), self)
+        elif not val.get("normalize"):
+            compiled["normalize"] = self._create_normalizer()
+        else:
+            raise SchemaError(name, val)
+
+        return compiled
 
     def _compile(self):
-        """Schemas compiler. Build regexps."""
+        """Schemas compiler. Build regexps.
 
-        # Load & clone RE patterns.
-        self.re = build_re(self._opts)
+        Rebuilds only what depends on configuration parts changed since the
+        last call: schema handlers are compiled again only after ``add()``,
+        and pattern sources are rebuilt per group, see ``_PATTERN_DEPS``.
+        """
+        changed = set(self._changed)
 
-        # Define dynamic patterns
-        tlds = copy.deepcopy(self._tlds)
+        if "schemas" in changed:
+            self._compile_schemas()
 
-        self._on_compile()
+        #
+        # Build schema condition
+        #
+        slist = "|".join(
+            [
+                _escape_re(name)
+                for name, val in self._compiled.items()
+                if len(name) > 0 and val
+            ]
+        )
 
-        if not self._tlds_replaced:
-            tlds.append(self.tlds_2ch_src_re)
-        tlds.append(self.re["src_xn"])
+        tld_set = bool(self._opts.get("tld_set"))
+        key = {
+            "options": bool(self._opts.get("---")),
+            # Patterns don't depend on tlds list in `tld_set` mode
+            "tlds": (
+                None
+                if tld_set
+                else (tuple(self._tlds), self._tlds_replaced, self.tlds_2ch_src_re)
+            ),
+            "schemas": slist,
+            # Changes compiled patterns only, sources are reused
+            "engine": get_engine(self._opts.get("engine")),
+        }
+        base = self._current_core.patterns
 
-        self.re["src_tlds"] = "|".join(tlds)
+        if not tld_set:
+            tlds = tlds_re = None
+        elif "tlds" in changed or self._current_core.tlds is None:
+            tlds, tlds_re = self._build_tld_set()
+        else:
+            tlds, tlds_re = self._current_core.tlds, self._current_core.tlds_re
 
-        def untpl(tpl):
-            return tpl.replace("%TLDS%", self.re["src_tlds"])
+        hooked = getattr(self._on_compile, "__func__", None) is not (
+            LinkifyIt._on_compile
+        )
 
-        self.re["email_fuzzy"] = untpl(self.re["tpl_email_fuzzy"])
+        if hooked:
+            # Patterns changed by `_on_compile` hook are not shared, and are
+            # always built from scratch
+            patterns = self._build_patterns(key)
+        elif key == base.key:
+            patterns = base
+        else:
+            patterns = PATTERN_CACHE.get(
+                tuple(key.values()), lambda: self._load_patterns(key, base)
+            )
 
-        self.re["link_fuzzy"] = untpl(self.re["tpl_link_fuzzy"])
+        # Hook can change what links look like, prefilter is off then
+        triggers = None
+        if not hooked:
+            triggers = _link_triggers(
+                [name for name, val in self._compiled.items() if name and val]
+            )
 
-        self.re["link_no_ip_fuzzy"] = untpl(self.re["tpl_link_no_ip_fuzzy"])
+        # Publish new compiled state at once. Instance gets own copy of sources,
+        # shared ones are never changed.
+        self._re = dict(patterns.re)
+        self._current_core = _Core(
+            self._re, self._compiled, patterns, tlds, tlds_re, triggers
+        )
+        self._changed -= changed
 
-        self.re["host_fuzzy_test"] = untpl(self.re["tpl_host_fuzzy_test"])
+        # Cleanup
+
+        self._reset_scan_cache()
+
+    def _compile_schemas(self):
+        """Compile handlers of all schemas into ``self._compiled``."""
 
         #
         # Compile each schema
@@ -289,42 +1753,13 @@ class LinkifyIt:
             if val is None:
                 continue
 
-            compiled = {"validate": None, "link": None}
-
-            self._compiled[name] = compiled
-
-            if isinstance(val, dict):
-                if isinstance(val.get("validate"), RE_TYPE):
-                    compiled["validate"] = self._create_validator(val.get("validate"))
-                elif isinstance(val.get("validate"), str):
-                    compiled["validate"] = self._create_validator(val.get("validate"))
-                elif isinstance(val.get("validate"), types.MethodType):
-                    compiled["validate"] = val.get("validate")
-                # Add custom handler
-                elif isinstance(val.get("validate"), types.FunctionType):
-                    setattr(LinkifyIt, "func", val.get("validate"))
-                    compiled["validate"] = self.func
-                else:
-                    raise SchemaError(name, val)
-
-                if isinstance(val.get("normalize"), types.MethodType):
-                    compiled["normalize"] = val.get("normalize")
-                # Add custom handler
-                elif isinstance(val.get("normalize"), types.FunctionType):
-                    setattr(LinkifyIt, "func", val.get("normalize"))
-                    compiled["normalize"] = self.func
-                elif not val.get("normalize"):
-                    compiled["normalize"] = self._create_normalizer()
-                else:
-                    raise SchemaError(name, val)
-
-                continue
+            compiled = self._compile_schema(name, val)
 
-            if isinstance(val, str):
+            if compiled is None:
                 aliases.append(name)
-                continue
+                compiled = {"validate": None, "link": None}
 
-            raise SchemaError(name, val)
+            self._compiled[name] = compiled
 
         #
         # Compile postponed aliases
@@ -343,17 +1778,158 @@ class LinkifyIt:
         # Fake record for guessed links
         self._compiled[""] = {"validate": None, "normalize": self._create_normalizer()}
 
-        #
-        # Build schema condition
-        #
-        slist = "|".join(
-            [
-                _escape_re(name)
-                for name, val in self._compiled.items()
-                if len(name) > 0 and val
-            ]
-        )
+    def _build_patterns(self, key, base=None):
+        """Build pattern sources for current options, tlds and schema names.
+
+        Only groups of sources which depend on parts of ``key`` different from
+        ``base.key`` are rebuilt, others are copied from ``base``.
+
+        Args:
+            key (dict): configuration part -> its value, see ``_PATTERN_DEPS``
+            base (:class:`_PatternSet`): Optional. Pattern set to build from,
+                everything is built from scratch if not set.
+
+        Returns:
+            :class:`_PatternSet`
+        """
+        if base is None or base.key is None:
+            changed = set(key)
+            self.re = {}
+        else:
+            changed = {part for part in key if key[part] != base.key.get(part)}
+            self.re = dict(base.re)
+
+        if changed.intersection(_PATTERN_DEPS["base"]):
+            self._build_base_re()
+        if changed.intersection(_PATTERN_DEPS["fuzzy"]):
+            self._build_fuzzy_re()
+        if changed.intersection(_PATTERN_DEPS["schema"]):
+            self._build_schema_re(key["schemas"])
+
+        return _PatternSet(self.re, key, base)
+
+    def _load_patterns(self, key, base=None):
+        """Create pattern set with sources saved in ``SOURCE_CACHE``, or build
+        and save them.
+
+        Args:
+            key (dict): configuration part -> its value, see ``_PATTERN_DEPS``
+            base (:class:`_PatternSet`): Optional. Pattern set to build from
+
+        Returns:
+            :class:`_PatternSet`
+        """
+        config = {part: key[part] for part in _PATTERN_DEPS["schema"]}
+
+        sources = SOURCE_CACHE.load(config)
+        if sources is not None:
+            return _PatternSet(sources, key, base)
+
+        patterns = self._build_patterns(key, base)
+        SOURCE_CACHE.save(config, patterns.re)
+        return patterns
+
+    def _build_base_re(self):
+        """Build sources which depend only on options: ``ucre`` building
+        blocks and built-in validators.
+        """
+        # Load & clone RE patterns.
+        self.re = build_re(self._opts)
+
+        self._on_compile()
+
+        # Built-in validators. Patterns are compiled on first use, and matched
+        # at the link prefix end. Hooks can set them with leading ``^`` (as
+        # validators searched the text tail before), it is not needed now.
+        for name in ("http", "not_http", "mailto"):
+            src = self.re.get(name)
+            if src and src.startswith("^"):
+                self.re[name] = src[1:]
+
+        if not self.re.get("http"):
+            self.re["http"] = (
+                "\\/\\/"
+                + self.re["src_auth"]
+                + self.re["src_host_port_strict"]
+                + self.re["src_path"]
+            )
+
+        if not self.re.get("not_http"):
+            self.re["not_http"] = (
+                self.re["src_auth"]
+                + "(?:localhost|(?:(?:"
+                + self.re["src_domain"]
+                + ")\\.)+"
+                + self.re["src_domain_root"]
+                + ")"
+                + self.re["src_port"]
+                + self.re["src_host_terminator"]
+                + self.re["src_path"]
+            )
+
+        if not self.re.get("mailto"):
+            self.re["mailto"] = (
+                self.re["src_email_name"] + "@" + self.re["src_host_strict"]
+            )
+
+    def _build_tld_set(self):
+        """Build tlds lookup of ``tld_set`` mode.
+
+        Returns:
+            tuple: (case folded tlds ``frozenset``, see :func:`_fold`, and
+            ``re.Pattern`` of tlds with regexp syntax or ``None``)
+        """
+        tlds = {_fold(tld) for tld in self._tlds if RE_PLAIN_TLD.match(tld)}
+        others = [tld for tld in self._tlds if not RE_PLAIN_TLD.match(tld)]
+
+        if not self._tlds_replaced:
+            tlds.update(_expand_2ch_tlds(self.tlds_2ch_src_re))
+
+        tlds_re = None
+        if others:
+            tlds_re = re.compile("(?:" + "|".join(others) + ")$", flags=re.IGNORECASE)
+
+        return frozenset(tlds), tlds_re
+
+    def _build_fuzzy_re(self):
+        """Build sources of fuzzy links & emails, which depend on tlds."""
+        if self._opts.get("tld_set"):
+            # Any root zone, checked after match by `_Core.valid_tld`
+            self.re["src_tlds"] = (
+                "(?P<tld>"
+                + self.re["src_xn"]
+                + "|"
+                + self.re["src_pseudo_letter"]
+                + "{1,63})"
+            )
+        else:
+            # Define dynamic patterns
+            tlds = list(self._tlds)
+
+            # 2-letter tlds are merged into the trie too
+            if not self._tlds_replaced:
+                tlds.extend(sorted(_expand_2ch_tlds(self.tlds_2ch_src_re)))
+            tlds.append(self.re["src_xn"])
+
+            self.re["src_tlds"] = _tlds_re(tlds)
+
+        def untpl(tpl):
+            return tpl.replace("%TLDS%", self.re["src_tlds"])
+
+        self.re["email_fuzzy"] = untpl(self.re["tpl_email_fuzzy"])
+
+        self.re["link_fuzzy"] = untpl(self.re["tpl_link_fuzzy"])
+
+        self.re["link_no_ip_fuzzy"] = untpl(self.re["tpl_link_no_ip_fuzzy"])
+
+        self.re["host_fuzzy_test"] = untpl(self.re["tpl_host_fuzzy_test"])
+
+    def _build_schema_re(self, slist):
+        """Build sources of schema search and pretest.
 
+        Args:
+            slist (str): escaped schema names, joined with ``|``
+        """
         re_schema_test = (
             "(^|(?!_)(?:[><\uff5c]|" + self.re["src_ZPCc"] + "))(" + slist + ")"
         )
@@ -367,10 +1943,6 @@ class LinkifyIt:
             "(" + re_schema_test + ")|(" + self.re["host_fuzzy_test"] + ")|@"
         )
 
-        # Cleanup
-
-        self._reset_scan_cache()
-
     def add(self, schema, definition):
         """Add new rule definition. (chainable)
 
@@ -387,25 +1959,109 @@ class LinkifyIt:
         Return:
             :class:`linkify_it.main.LinkifyIt`
         """
+        # Check definition now, so errors point to this call
+        if definition is not None:
+            self._compile_schema(schema, definition)
+
         self._schemas[schema] = definition
-        self._compile()
+        self._invalidate("schemas")
         return self
 
     def set(self, options):
         """Override default options. (chainable)
 
-        Missed properties will not be changed.
+        Missed properties will not be changed. Only the ``---``, ``tld_set`` and
+        ``engine`` options change patterns; other options are read on each scan
+        and cost nothing to change.
 
         Args:
             options (dict): ``keys``: [``fuzzy_link`` | ``fuzzy_email`` | ``fuzzy_ip``].
                 ``values``: [``True`` | ``False``]
 
+        Raises:
+            ValueError: if ``scanner`` or ``engine`` is unknown
+
         Return:
             :class:`linkify_it.main.LinkifyIt`
         """
+        # Check before update, so invalid values are not kept
+        if "scanner" in options:
+            _get_scanner(options["scanner"])
+        if "engine" in options:
+            get_engine(options["engine"])
+
         self._opts.update(options)
+        if "---" in options:
+            self._invalidate("options")
+        if "tld_set" in options:
+            self._invalidate("tlds")
+        if "engine" in options:
+            self._invalidate("engine")
+        if not self._changed:
+            self._reset_scan_cache()
         return self
 
+    def snapshot(self):
+        """Picklable snapshot of configuration: options, schemas and tlds.
+
+        Custom ``validate`` / ``normalize`` functions are stored as importable
+        references, so they must be defined at module level. Rebuild linkifier
+        with :meth:`linkify_it.main.LinkifyIt.from_snapshot`.
+
+        Raises:
+            SchemaError: if schema handler is not importable (lambda, closure)
+
+        Returns:
+            dict: configuration snapshot
+        """
+        schemas = {}
+        for name, val in self._schemas.items():
+            if isinstance(val, dict):
+                val = {
+                    key: (
+                        _Ref.from_callable(self, name, handler)
+                        if callable(handler)
+                        else handler
+                    )
+                    for key, handler in val.items()
+                }
+            schemas[name] = val
+
+        return {
+            "options": dict(self._opts),
+            "schemas": schemas,
+            "tlds": list(self._tlds),
+            "tlds_replaced": self._tlds_replaced,
+        }
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """Create linkifier from :meth:`linkify_it.main.LinkifyIt.snapshot`.
+
+        Args:
+            snapshot (dict): configuration snapshot
+
+        Returns:
+            :class:`linkify_it.main.LinkifyIt`
+        """
+        schemas = {}
+        for name, val in snapshot["schemas"].items():
+            if isinstance(val, dict):
+                val = {
+                    key: handler.resolve() if isinstance(handler, _Ref) else handler
+                    for key, handler in val.items()
+                }
+            schemas[name] = val
+
+        linkifyit = cls(schemas, dict(snapshot["options"]))
+        linkifyit._tlds = list(snapshot["tlds"])
+        linkifyit._tlds_replaced = snapshot["tlds_replaced"]
+        linkifyit._invalidate("tlds")
+        return linkifyit
+
+    def __reduce__(self):
+        return (type(self).from_snapshot, (self.snapshot(),))
+
     def test(self, text):
         """Searches linkifiable pattern and returns ``True`` on success or ``False``
         on fail.
@@ -416,73 +2072,13 @@ class LinkifyIt:
         Returns:
             bool: ``True`` if a linkable pattern was found, otherwise it is ``False``.
         """
-        self._text_cache = text
-        self._index = -1
+        scanner = self._create_scanner(text)
+        found = scanner.scan()
 
-        if not len(text):
-            return False
+        # Keep text only if there is a match to reuse, don't hold big documents
+        self._local.scan = (scanner.core, text, found) if found else None
 
-        if re.search(self.re["schema_test"], text, flags=re.IGNORECASE):
-            regex = self.re["schema_search"]
-            last_index = 0
-            matched_iter = re.finditer(regex, text[last_index:], flags=re.IGNORECASE)
-            for matched in matched_iter:
-                last_index = matched.end(0)
-                m = (matched.group(), matched.groups()[0], matched.groups()[1])
-                length = self.test_schema_at(text, m[2], last_index)
-                if length:
-                    self._schema = m[2]
-                    self._index = matched.start(0) + len(m[1])
-                    self._last_index = matched.start(0) + len(m[0]) + length
-                    break
-
-        if self._opts.get("fuzzy_link") and self._compiled.get("http:"):
-            # guess schemaless links
-            matched_tld = re.search(
-                self.re["host_fuzzy_test"], text, flags=re.IGNORECASE
-            )
-            if matched_tld:
-                tld_pos = matched_tld.start(0)
-            else:
-                tld_pos = -1
-            if tld_pos >= 0:
-                # if tld is located after found link - no need to check fuzzy pattern
-                if self._index < 0 or tld_pos < self._index:
-                    if self._opts.get("fuzzy_ip"):
-                        pattern = self.re["link_fuzzy"]
-                    else:
-                        pattern = self.re["link_no_ip_fuzzy"]
-
-                    ml = re.search(pattern, text, flags=re.IGNORECASE)
-                    if ml:
-                        shift = ml.start(0) + len(ml.groups()[0])
-
-                        if self._index < 0 or shift < self._index:
-                            self._schema = ""
-                            self._index = shift
-                            self._last_index = ml.start(0) + len(ml.group())
-
-        if self._opts.get("fuzzy_email") and self._compiled.get("mailto:"):
-            # guess schemaless emails
-            at_pos = _index_of(text, "@")
-            if at_pos >= 0:
-                # We can't skip this check, because this cases are possible:
-                # 192.168.1.1@gmail.com, my.in@example.com
-                me = re.search(self.re["email_fuzzy"], text, flags=re.IGNORECASE)
-                if me:
-                    shift = me.start(0) + len(me.groups()[0])
-                    next_shift = me.start(0) + len(me.group())
-
-                    if (
-                        self._index < 0
-                        or shift < self._index
-                        or (shift == self._index and next_shift > self._last_index)
-                    ):
-                        self._schema = "mailto:"
-                        self._index = shift
-                        self._last_index = next_shift
-
-        return self._index >= 0
+        return found is not None
 
     def pretest(self, text):
         """Very quick check, that can give false positives.
@@ -496,7 +2092,10 @@ class LinkifyIt:
         Returns:
             bool: ``True`` if a linkable pattern was found, otherwise it is ``False``.
         """
-        if re.search(self.re["pretest"], text, flags=re.IGNORECASE):
+        if not self._core.may_have_link(text):
+            return False
+
+        if self._core.pattern("pretest", text.isascii()).search(text):
             return True
 
         return False
@@ -513,10 +2112,12 @@ class LinkifyIt:
         Returns:
             int: text (str): text to search
         """
+        compiled = self._core.compiled
+
         # If not supported schema check requested - terminate
-        if not self._compiled.get(name.lower()):
+        if not compiled.get(name.lower()):
             return 0
-        return self._compiled.get(name.lower()).get("validate")(text, position)
+        return compiled.get(name.lower()).get("validate")(text, position)
 
     def match(self, text):
         """Returns ``list`` of found link descriptions or ``None`` on fail.
@@ -537,29 +2138,137 @@ class LinkifyIt:
                 * **text** - normalized text
                 * **url** - link, generated from matched text
         """
-        shift = 0
         result = []
+        scanner = self._create_scanner(text)
 
         # try to take previous element from cache, if .test() called before
-        if self._index >= 0 and self._text_cache == text:
-            result.append(self._create_match(shift))
-            shift = self._last_index
-
-        # Cut head if cache was used
-        tail = text[shift:] if shift else text
+        core, text_cache, found = self._last_scan()
+        if core is scanner.core and text_cache is text:
+            result.append(self._create_match(core, text, found))
+            scanner.pos = found[2]
+        self._reset_scan_cache()
 
         # Scan string until end reached
-        while self.test(tail):
-            result.append(self._create_match(shift))
-
-            tail = tail[self._last_index :]
-            shift += self._last_index
+        result.extend(self._iter_matches(scanner))
 
         if len(result):
             return result
 
         return None
 
+    def match_many(self, texts, only_indexes=False):
+        """Batch version of :meth:`linkify_it.main.LinkifyIt.match`.
+
+        Scans many texts (for example, chat messages) with one compiled state,
+        skipping per-call setup of ``match``.
+
+        Args:
+            texts (iterable of str): texts to search
+            only_indexes (bool): return only indexes of texts with links
+                (``False`` by default)
+
+        Returns:
+            ``list``: ``match`` result (``list`` or ``None``) for each text, in
+            order. Or indexes of texts with links, if ``only_indexes`` is set.
+        """
+        core = self._core
+        compiled = core.compiled
+        create_match = Match._from_scan
+        results = []
+        append = results.append
+
+        for idx, text in enumerate(texts):
+            if not text:
+                if not only_indexes:
+                    append(None)
+                continue
+
+            scanner = self._create_scanner(text, core)
+            found = scanner.scan()
+
+            if only_indexes:
+                if found:
+                    append(idx)
+                continue
+
+            if not found:
+                append(None)
+                continue
+
+            matches = []
+            while found:
+                normalize = compiled[found[0].lower()]["normalize"]
+                matches.append(create_match(text, *found, normalize))
+                found = scanner.scan()
+            append(matches)
+
+        return results
+
+    def parallel_match(self, texts, workers=None, chunksize=256):
+        """Like :meth:`linkify_it.main.LinkifyIt.match_many`, in worker processes.
+
+        Linkifier is rebuilt once per worker from
+        :meth:`linkify_it.main.LinkifyIt.snapshot`, texts are sent in chunks, and
+        results are yielded back in input order as they are ready.
+
+        Args:
+            texts (iterable of str): texts to search
+            workers (int): number of processes, ``os.cpu_count()`` by default
+            chunksize (int): number of texts sent to a worker at once
+
+        Returns:
+            iterator: ``match`` result (``list`` or ``None``) for each text
+        """
+        workers = workers or os.cpu_count() or 1
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(type(self), self.snapshot()),
+        ) as executor:
+            pending = collections.deque()
+            chunk = []
+
+            for text in texts:
+                chunk.append(text)
+                if len(chunk) < chunksize:
+                    continue
+
+                pending.append(executor.submit(_match_chunk, chunk))
+                chunk = []
+                # Limit texts in flight
+                if len(pending) > workers * 2:
+                    yield from pending.popleft().result()
+
+            if chunk:
+                pending.append(executor.submit(_match_chunk, chunk))
+
+            while pending:
+                yield from pending.popleft().result()
+
+    def finditer(self, text):
+        """Returns iterator, which lazily yields found link descriptions.
+
+        Same links as :meth:`linkify_it.main.LinkifyIt.match`, in the same order,
+        but text is scanned only as far as the consumer goes. Stopping iteration
+        early skips the rest of the text.
+
+        Args:
+            text (str): text to search
+
+        Returns:
+            iterator of :class:`linkify_it.main.Match`
+        """
+        return self._iter_matches(self._create_scanner(text))
+
+    def _iter_matches(self, scanner):
+        found = scanner.scan()
+        while found:
+            yield self._create_match(scanner.core, scanner.text, found)
+            found = scanner.scan()
+
     def match_at_start(self, text):
         """Returns fully-formed (not fuzzy) link if it starts at the beginning
         of the string, and null otherwise.
@@ -570,14 +2279,15 @@ class LinkifyIt:
         Retuns:
             ``Match`` or ``None``
         """
+        core = self._core
+
         # Reset scan cache
-        self._text_cache = text
-        self._index = -1
+        self._reset_scan_cache()
 
         if not len(text):
             return None
 
-        founds = re.search(self.re["schema_at_start"], text, flags=re.IGNORECASE)
+        founds = core.pattern("schema_at_start", text.isascii()).search(text)
         if not founds:
             return None
 
@@ -586,11 +2296,14 @@ class LinkifyIt:
         if not length:
             return None
 
-        self._schema = m[2]
-        self._index = founds.start(0) + len(m[1])
-        self._last_index = founds.start(0) + len(m[0]) + length
+        found = (
+            m[2],
+            founds.start(0) + len(m[1]),
+            founds.start(0) + len(m[0]) + length,
+        )
+        self._local.scan = (core, text, found)
 
-        return self._create_match(0)
+        return self._create_match(core, text, found)
 
     def tlds(self, list_tlds, keep_old=False):
         """Load (or merge) new tlds list. (chainable)
@@ -614,15 +2327,31 @@ class LinkifyIt:
         if not keep_old:
             self._tlds = _list
             self._tlds_replaced = True
-            self._compile()
+            self._invalidate("tlds")
             return self
 
         self._tlds.extend(_list)
         self._tlds = sorted(list(set(self._tlds)), reverse=True)
 
-        self._compile()
+        self._invalidate("tlds")
         return self
 
+    def iana_tlds(self, keep_old=False):
+        """Load (or merge) full IANA tlds list from :mod:`linkify_it.tlds`.
+        (chainable)
+
+        The list is imported on first call. Plain tld names are merged into a
+        prefix trie regexp, so the full list costs little more to scan than the
+        default one.
+
+        Args:
+            keep_old (bool): merge with current list if ``True`` (``False`` by
+                default)
+        """
+        from .tlds import TLDS
+
+        return self.tlds(list(TLDS), keep_old)
+
     def normalize(self, match):
         """Default normalizer (if schema does not define it's own).
 
@@ -632,11 +2361,14 @@ class LinkifyIt:
         if not match.schema:
             match.url = "http://" + match.url
 
-        if match.schema == "mailto:" and not re.search(
-            "^mailto:", match.url, flags=re.IGNORECASE
-        ):
+        if match.schema == "mailto:" and not RE_MAILTO.search(match.url):
             match.url = "mailto:" + match.url
 
     def _on_compile(self):
-        """Override to modify basic RegExp-s."""
+        """Override to modify basic RegExp-s.
+
+        ``self.re`` sources of built-in validators (``http``, ``not_http``,
+        ``mailto``) set here are matched right after the link prefix. Leading
+        ``^`` is optional, it is removed.
+        """
         pass
@@ -1,147 +1,341 @@
-from uc_micro.categories import Cc, Cf, P, Z
-from uc_micro.properties import Any
+import re
+import types
+from functools import lru_cache
 
-SRC_ANY = Any.REGEX
-SRC_CC = Cc.REGEX
-SRC_CF = Cf.REGEX
-SRC_P = P.REGEX
-SRC_Z = Z.REGEX
 
-# \p{\Z\P\Cc\CF} (white spaces + control + format + punctuation)
-SRC_ZPCC = "|".join([SRC_Z, SRC_P, SRC_CC])
+@lru_cache(maxsize=1)
+def _bmp():
+    """All BMP chars, except surrogates."""
+    return "".join(map(chr, range(0xD800))) + "".join(map(chr, range(0xE000, 0x10000)))
+
+
+@lru_cache(maxsize=None)
+def _class_ranges(src):
+    """BMP code point ranges matched by ``src`` (with ``re.IGNORECASE``).
+
+    uc_micro regexps are JS style: a BMP class plus surrogate pair
+    alternatives, which never match astral chars of a python ``str``.
+
+    Args:
+        src (str): regex matching single chars
+
+    Returns:
+        tuple: ``(first, last)`` code point pairs, sorted
+    """
+    found = sorted(map(ord, set(re.findall(src, _bmp(), flags=re.IGNORECASE))))
+    ranges = []
+    for code in found:
+        if ranges and ranges[-1][1] == code - 1:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+    return tuple(map(tuple, ranges))
+
+
+def _escape(code):
+    return "\\u%04x" % code if code <= 0xFFFF else "\\U%08x" % code
+
+
+def _items(ranges):
+    return "".join(
+        _escape(first) if first == last else _escape(first) + "-" + _escape(last)
+        for first, last in ranges
+    )
+
+
+# Merged class -> the same class restricted to ASCII, see `ascii_src`
+_ASCII_CLASSES = {}
+
+
+@lru_cache(maxsize=None)
+def _class(*srcs, negate=False, astral=False):
+    """Merge single char regexps into one ``[...]`` class.
+
+    Each source becomes its code point ranges, so a char costs one class
+    test instead of a walk over the alternatives of every source.
+
+    Ranges are closed under ``re.IGNORECASE`` case folding, so the class is
+    put in a case sensitive group: engines with other Unicode versions (see
+    :mod:`linkify_it.engines`) can't fold it in their own way. Negated classes
+    are built as positive ones, with complement ranges, for the same reason.
+
+    Args:
+        srcs (str): regexps matching single chars
+        negate (bool): match chars not matched by ``srcs``
+        astral (bool): add all astral chars (``U+10000`` and above)
+
+    Returns:
+        str: regex class, in case sensitive group
+    """
+    ranges = sorted(r for src in srcs for r in _class_ranges(src))
+    if astral:
+        ranges.append((0x10000, 0x10FFFF))
+    merged = []
+    for first, last in ranges:
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], last)
+        else:
+            merged.append([first, last])
+
+    if negate:
+        complement = []
+        start = 0
+        for first, last in merged:
+            if first > start:
+                complement.append([start, first - 1])
+            start = last + 1
+        if start <= 0x10FFFF:
+            complement.append([start, 0x10FFFF])
+        merged = complement
+
+    result = "(?-i:[" + _items(merged) + "])"
+
+    ascii_ranges = [(first, min(last, 0x7F)) for first, last in merged if first <= 0x7F]
+    _ASCII_CLASSES[result] = (
+        "[" + _items(ascii_ranges) + "]" if ascii_ranges else "(?!)"
+    )
+
+    return result
+
+
+def ascii_src(src):
+    """Restrict merged Unicode classes of pattern ``src`` to ASCII chars.
+
+    Resulting pattern matches ASCII texts exactly as ``src`` does, but with
+    small classes, which are faster to test.
+
+    Args:
+        src (str): pattern source
+
+    Return:
+        str: pattern source for ASCII texts
+    """
+    for unicode_class, ascii_class in _ASCII_CLASSES.items():
+        src = src.replace(unicode_class, ascii_class)
+    return src
+
+
+def ascii_classes(srcs):
+    """ASCII variants of merged Unicode classes used in pattern sources, to
+    store them with the sources.
+
+    Args:
+        srcs (iterable): pattern sources
+
+    Return:
+        dict: Unicode class -> its ASCII variant
+    """
+    srcs = list(srcs)
+    return {
+        unicode_class: ascii_class
+        for unicode_class, ascii_class in _ASCII_CLASSES.items()
+        if any(unicode_class in src for src in srcs)
+    }
+
+
+def add_ascii_classes(classes):
+    """Register ASCII variants of classes, used in sources loaded from
+    storage, for :func:`ascii_src`.
+
+    Args:
+        classes (dict): Unicode class -> its ASCII variant
+    """
+    _ASCII_CLASSES.update(classes)
 
-# \p{\Z\Cc} (white spaces + control)
-SRC_ZCC = "|".join([SRC_Z, SRC_CC])
 
 # Experimental. List of chars, completely prohibited in links
 # because can separate it from other part of text
 TEXT_SEPARATORS = "[><\uff5c]"
 
-# All possible word characters (everything without punctuation, spaces & controls)
-# Defined via punctuation & spaces to save space
-# Should be something like \p{\L\N\S\M} (\w but without `_`)
-SRC_PSEUDO_LETTER = "(?:(?!" + TEXT_SEPARATORS + "|" + SRC_ZPCC + ")" + SRC_ANY + ")"
-# The same as abothe but without [0-9]
-# var SRC_PSEUDO_LETTER_non_d = '(?:(?![0-9]|' + SRC_ZPCC + ')' + SRC_ANY + ')'
-
-# =============================================================================
+# Symbols, which can precede fuzzy link (besides spaces & punctuation), but
+# not start it
+SRC_LINK_SYMBOLS = "[$+<=>^`|\uff5c]"
 
 SRC_IP4 = (
     "(?:(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\\.){3}(25[0-5]|"
     + "2[0-4][0-9]|[01]?[0-9][0-9]?)"
 )
 
-# Prohibit any of "@/[]()" in user/pass to avoid wrong domain fetch.
-SRC_AUTH = "(?:(?:(?!" + SRC_ZCC + "|[@/\\[\\]()]).)+@)?"
-
 SRC_PORT = (
     "(?::(?:6(?:[0-4]\\d{3}|5(?:[0-4]\\d{2}|5(?:[0-2]\\d|3[0-5])))|[1-5]?\\d{1,4}))?"
 )
 
+# ``re.IGNORECASE`` matches ``i`` with dotted ``İ`` and dotless ``ı``, Unicode
+# case folding (used by other engines) doesn't. Classes of ASCII letters list
+# them, so all engines match the same.
+SRC_I_VARIANTS = "\u0130\u0131"
+
 # Allow anything in markdown spec, forbid quote (") at the first position
 # because emails enclosed in quotes are far more common
-SRC_EMAIL_NAME = '[\\-:&=\\+\\$,\\.a-zA-Z0-9_][\\-:&=\\+\\$,\\"\\.a-zA-Z0-9_]*'
-
-SRC_XN = "xn--[a-z0-9\\-]{1,59}"
-
-# More to read about domain names
-# http:#serverfault.com/questions/638260/
-
-# Allow letters & digits (http:#test1)
-SRC_DOMAIN_ROOT = "(?:" + SRC_XN + "|" + SRC_PSEUDO_LETTER + "{1,63}" + ")"
-
-SRC_DOMAIN = (
-    "(?:"
-    + SRC_XN
-    + "|"
-    + "(?:"
-    + SRC_PSEUDO_LETTER
-    + ")"
-    + "|"
-    + "(?:"
-    + SRC_PSEUDO_LETTER
-    + "(?:-|"
-    + SRC_PSEUDO_LETTER
-    + "){0,61}"
-    + SRC_PSEUDO_LETTER
-    + ")"
-    + ")"
+SRC_EMAIL_NAME_CHAR = '[\\-:&=\\+\\$,\\"\\.a-zA-Z0-9_' + SRC_I_VARIANTS + "]"
+SRC_EMAIL_NAME = (
+    "[\\-:&=\\+\\$,\\.a-zA-Z0-9_" + SRC_I_VARIANTS + "]" + SRC_EMAIL_NAME_CHAR + "*"
 )
 
-SRC_HOST = (
-    "(?:"
-    +
-    # Don't need IP check, because digits are already allowed in normal domain names
-    # SRC_IP4 +
-    # '|' +
-    "(?:(?:(?:"
-    + SRC_DOMAIN
-    + ")\\.)*"
-    + SRC_DOMAIN  # _root
-    + ")"
-    + ")"
-)
+SRC_XN = "xn--[a-z0-9\\-" + SRC_I_VARIANTS + "]{1,59}"
 
-TPL_HOST_FUZZY = (
-    "(?:" + SRC_IP4 + "|" + "(?:(?:(?:" + SRC_DOMAIN + ")\\.)+(?:%TLDS%))" + ")"
-)
 
-TPL_HOST_NO_IP_FUZZY = "(?:(?:(?:" + SRC_DOMAIN + ")\\.)+(?:%TLDS%))"
+@lru_cache(maxsize=1)
+def _unicode_sources():
+    """Build sources, which depend on ``uc_micro`` data.
 
+    Merging Unicode classes takes time, so it is done on first use, not on
+    import. Results are also available as module attributes (``SRC_ZPCC``,
+    ``SRC_HOST``, ...).
 
-# =============================================================================
+    Return:
+        types.SimpleNamespace: sources by name
+    """
+    from uc_micro.categories import Cc, Cf, P, Z
+    from uc_micro.properties import Any
+
+    SRC_ANY = Any.REGEX
+    SRC_CC = Cc.REGEX
+    SRC_CF = Cf.REGEX
+    SRC_P = P.REGEX
+    SRC_Z = Z.REGEX
+
+    # \p{\Z\P\Cc\CF} (white spaces + control + format + punctuation)
+    SRC_ZPCC = _class(SRC_Z, SRC_P, SRC_CC)
+
+    # \p{\Z\Cc} (white spaces + control)
+    SRC_ZCC = _class(SRC_Z, SRC_CC)
+
+    # All possible word characters (everything without punctuation, spaces &
+    # controls). Defined via punctuation & spaces to save space
+    # Should be something like \p{\L\N\S\M} (\w but without `_`)
+    # Astral chars never match the JS style SRC_ANY, so they are excluded too.
+    SRC_PSEUDO_LETTER = _class(
+        TEXT_SEPARATORS, SRC_Z, SRC_P, SRC_CC, negate=True, astral=True
+    )
+    # The same as abothe but without [0-9]
+    # var SRC_PSEUDO_LETTER_non_d = '(?:(?![0-9]|' + SRC_ZPCC + ')' + SRC_ANY + ')'
 
-# Rude test fuzzy links by host, for quick deny
-TPL_HOST_FUZZY_TEST = (
-    "localhost|www\\.|\\.\\d{1,3}\\.|(?:\\.(?:%TLDS%)(?:" + SRC_ZPCC + "|>|$))"
-)
+    # =========================================================================
+
+    # Prohibit any of "@/[]()" in user/pass to avoid wrong domain fetch.
+    SRC_AUTH = "(?:" + _class(SRC_Z, SRC_CC, "[@/\\[\\]()]", negate=True) + "+@)?"
+
+    # More to read about domain names
+    # http:#serverfault.com/questions/638260/
+
+    # Allow letters & digits (http:#test1)
+    SRC_DOMAIN_ROOT = "(?:" + SRC_XN + "|" + SRC_PSEUDO_LETTER + "{1,63}" + ")"
+
+    SRC_DOMAIN = (
+        "(?:"
+        + SRC_XN
+        + "|"
+        + "(?:"
+        + SRC_PSEUDO_LETTER
+        + ")"
+        + "|"
+        + "(?:"
+        + SRC_PSEUDO_LETTER
+        + "(?:-|"
+        + SRC_PSEUDO_LETTER
+        + "){0,61}"
+        + SRC_PSEUDO_LETTER
+        + ")"
+        + ")"
+    )
+
+    SRC_HOST = (
+        "(?:"
+        +
+        # Don't need IP check, because digits are already allowed in normal
+        # domain names
+        # SRC_IP4 +
+        # '|' +
+        "(?:(?:(?:"
+        + SRC_DOMAIN
+        + ")\\.)*"
+        + SRC_DOMAIN  # _root
+        + ")"
+        + ")"
+    )
+
+    TPL_HOST_FUZZY = (
+        "(?:" + SRC_IP4 + "|" + "(?:(?:(?:" + SRC_DOMAIN + ")\\.)+(?:%TLDS%))" + ")"
+    )
+
+    TPL_HOST_NO_IP_FUZZY = "(?:(?:(?:" + SRC_DOMAIN + ")\\.)+(?:%TLDS%))"
+
+    # =========================================================================
+
+    # Rude test fuzzy links by host, for quick deny
+    TPL_HOST_FUZZY_TEST = (
+        "localhost|www\\.|\\.\\d{1,3}\\.|(?:\\.(?:%TLDS%)(?:" + SRC_ZPCC + "|>|$))"
+    )
+
+    return types.SimpleNamespace(
+        **{
+            name: value
+            for name, value in locals().items()
+            if name.startswith(("SRC_", "TPL_"))
+        }
+    )
+
+
+def __getattr__(name):
+    # Unicode sources as module attributes, built on first access
+    if name.startswith(("SRC_", "TPL_")):
+        sources = _unicode_sources()
+        if hasattr(sources, name):
+            return getattr(sources, name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
 
 
 def _re_host_terminator(opts):
+    u = _unicode_sources()
     src_host_terminator = (
         "(?=$|"
-        + TEXT_SEPARATORS
-        + "|"
-        + SRC_ZPCC
+        + _class(TEXT_SEPARATORS, u.SRC_Z, u.SRC_P, u.SRC_CC)
         + ")"
         + "(?!"
         + ("-(?!--)|" if opts.get("---") else "-|")
         + "_|:\\d|\\.-|\\.(?!$|"
-        + SRC_ZPCC
+        + u.SRC_ZPCC
         + "))"
     )
     return src_host_terminator
 
 
+def _not_zcc(*srcs):
+    """Class of chars, which are neither Z, Cc nor matched by ``srcs``."""
+    u = _unicode_sources()
+    return _class(u.SRC_Z, u.SRC_CC, *srcs, negate=True)
+
+
 def _re_src_path(opts):
+    u = _unicode_sources()
     src_path = (
         "(?:"
         + "[/?#]"
         + "(?:"
-        + "(?!"
-        + SRC_ZCC
+        + _not_zcc(TEXT_SEPARATORS, "[()[\\]{}.,\"'?!\\-;]")
         + "|"
-        + TEXT_SEPARATORS
-        + "|[()[\\]{}.,\"'?!\\-;]).|"
-        + "\\[(?:(?!"
-        + SRC_ZCC
-        + "|\\]).)*\\]|"
-        + "\\((?:(?!"
-        + SRC_ZCC
-        + "|[)]).)*\\)|"
-        + "\\{(?:(?!"
-        + SRC_ZCC
-        + "|[}]).)*\\}|"
-        + '\\"(?:(?!'
-        + SRC_ZCC
-        + '|["]).)+\\"|'
-        + "\\'(?:(?!"
-        + SRC_ZCC
-        + "|[']).)+\\'|"
+        + "\\["
+        + _not_zcc("\\]")
+        + "*\\]|"
+        + "\\("
+        + _not_zcc("[)]")
+        + "*\\)|"
+        + "\\{"
+        + _not_zcc("[}]")
+        + "*\\}|"
+        + '\\"'
+        + _not_zcc('["]')
+        + '+\\"|'
+        + "\\'"
+        + _not_zcc("[']")
+        + "+\\'|"
         + "\\'(?="
-        + SRC_PSEUDO_LETTER
+        + u.SRC_PSEUDO_LETTER
         + "|[-])|"
-        + "\\.{2,}[a-zA-Z0-9%/&]|"
+        + "\\.{2,}[a-zA-Z0-9%/&"
+        + SRC_I_VARIANTS
+        + "]|"
         # google has many dots in "google search" links (#66, #81).
         # github has ... in commit range links,
         # ReSTRICT to
@@ -151,21 +345,21 @@ def _re_src_path(opts):
         # - params separator
         # until more examples found.
         + "\\.(?!"
-        + SRC_ZCC
-        + "|[.]|$)|"
+        + _class(u.SRC_Z, u.SRC_CC, "[.]")
+        + "|$)|"
         + ("\\-(?!--(?:[^-]|$))(?:-*)|" if opts.get("---") else "\\-+|")
         + ",(?!"
-        + SRC_ZCC
+        + u.SRC_ZCC
         + "|$)|"  # allow `,,,` in paths
         + ";(?!"
-        + SRC_ZCC
+        + u.SRC_ZCC
         + "|$)|"  # allow `,,,` in paths
         + "\\!+(?!"
-        + SRC_ZCC
-        + "|[!]|$)|"  # allow `!!!` in paths, but not at the end
+        + _class(u.SRC_Z, u.SRC_CC, "[!]")
+        + "|$)|"  # allow `!!!` in paths, but not at the end
         + "\\?(?!"
-        + SRC_ZCC
-        + "|[?]|$)"
+        + _class(u.SRC_Z, u.SRC_CC, "[?]")
+        + "|$)"
         + ")+"
         + "|\\/"
         + ")?"
@@ -183,23 +377,25 @@ def build_re(opts):
     Return:
         dict: dict of regex string
     """
-    SRC_HOST_STRICT = SRC_HOST + _re_host_terminator(opts)
+    u = _unicode_sources()
 
-    TPL_HOST_FUZZY_STRICT = TPL_HOST_FUZZY + _re_host_terminator(opts)
+    SRC_HOST_STRICT = u.SRC_HOST + _re_host_terminator(opts)
 
-    SRC_HOST_PORT_STRICT = SRC_HOST + SRC_PORT + _re_host_terminator(opts)
+    TPL_HOST_FUZZY_STRICT = u.TPL_HOST_FUZZY + _re_host_terminator(opts)
 
-    TPL_HOST_PORT_FUZZY_STRICT = TPL_HOST_FUZZY + SRC_PORT + _re_host_terminator(opts)
+    SRC_HOST_PORT_STRICT = u.SRC_HOST + SRC_PORT + _re_host_terminator(opts)
+
+    TPL_HOST_PORT_FUZZY_STRICT = u.TPL_HOST_FUZZY + SRC_PORT + _re_host_terminator(opts)
 
     TPL_HOST_PORT_NO_IP_FUZZY_STRICT = (
-        TPL_HOST_NO_IP_FUZZY + SRC_PORT + _re_host_terminator(opts)
+        u.TPL_HOST_NO_IP_FUZZY + SRC_PORT + _re_host_terminator(opts)
     )
 
     TPL_EMAIL_FUZZY = (
         "(^|"
         + TEXT_SEPARATORS
         + '|"|\\(|'
-        + SRC_ZCC
+        + u.SRC_ZCC
         + ")"
         + "("
         + SRC_EMAIL_NAME
@@ -209,41 +405,45 @@ def build_re(opts):
     )
 
     regex = {
-        "src_Any": SRC_ANY,
-        "src_Cc": SRC_CC,
-        "src_Cf": SRC_CF,
-        "src_Z": SRC_Z,
-        "src_P": SRC_P,
-        "src_ZPCc": SRC_ZPCC,
-        "src_ZCc": SRC_ZCC,
-        "src_pseudo_letter": SRC_PSEUDO_LETTER,
+        "src_Any": u.SRC_ANY,
+        "src_Cc": u.SRC_CC,
+        "src_Cf": u.SRC_CF,
+        "src_Z": u.SRC_Z,
+        "src_P": u.SRC_P,
+        "src_ZPCc": u.SRC_ZPCC,
+        "src_ZCc": u.SRC_ZCC,
+        "src_pseudo_letter": u.SRC_PSEUDO_LETTER,
         "src_ip4": SRC_IP4,
-        "src_auth": SRC_AUTH,
+        "src_auth": u.SRC_AUTH,
         "src_port": SRC_PORT,
         "src_host_terminator": _re_host_terminator(opts),
         "src_path": _re_src_path(opts),
         "src_email_name": SRC_EMAIL_NAME,
+        "src_email_name_char": SRC_EMAIL_NAME_CHAR,
+        "src_link_symbols": SRC_LINK_SYMBOLS,
         "src_xn": SRC_XN,
-        "src_domain_root": SRC_DOMAIN_ROOT,
-        "src_domain": SRC_DOMAIN,
-        "src_host": SRC_HOST,
-        "tpl_host_fuzzy": TPL_HOST_FUZZY,
-        "tpl_host_no_ip_fuzzy": TPL_HOST_NO_IP_FUZZY,
+        "src_domain_root": u.SRC_DOMAIN_ROOT,
+        "src_domain": u.SRC_DOMAIN,
+        "src_host": u.SRC_HOST,
+        "tpl_host_fuzzy": u.TPL_HOST_FUZZY,
+        "tpl_host_no_ip_fuzzy": u.TPL_HOST_NO_IP_FUZZY,
         "src_host_strict": SRC_HOST_STRICT,
         "tpl_host_fuzzy_strict": TPL_HOST_FUZZY_STRICT,
         "src_host_port_strict": SRC_HOST_PORT_STRICT,
         "tpl_host_port_fuzzy_strict": TPL_HOST_PORT_FUZZY_STRICT,
         "tpl_host_port_no_ip_fuzzy_strict": TPL_HOST_PORT_FUZZY_STRICT,
         # Main rules
-        "tpl_host_fuzzy_test": TPL_HOST_FUZZY_TEST,
+        "tpl_host_fuzzy_test": u.TPL_HOST_FUZZY_TEST,
         "tpl_email_fuzzy": TPL_EMAIL_FUZZY,
         # Fuzzy link can't be prepended with .:/\- and non punctuation.
         # but can start with > (markdown blockquote)
         "tpl_link_fuzzy": (
-            "(^|(?![.:/\\-_@])(?:[$+<=>^`|\uff5c]|"
-            + SRC_ZPCC
+            "(^|(?![.:/\\-_@])(?:"
+            + _class(SRC_LINK_SYMBOLS, u.SRC_Z, u.SRC_P, u.SRC_CC)
             + "))"
-            + "((?![$+<=>^`|\uff5c])"
+            + "((?!"
+            + SRC_LINK_SYMBOLS
+            + ")"
             + TPL_HOST_PORT_FUZZY_STRICT
             + _re_src_path(opts)
             + ")"
@@ -251,10 +451,12 @@ def build_re(opts):
         # Fuzzy link can't be prepended with .:/\- and non punctuation.
         # but can start with > (markdown blockquote)
         "tpl_link_no_ip_fuzzy": (
-            "(^|(?![.:/\\-_@])(?:[$+<=>^`|\uff5c]|"
-            + SRC_ZPCC
+            "(^|(?![.:/\\-_@])(?:"
+            + _class(SRC_LINK_SYMBOLS, u.SRC_Z, u.SRC_P, u.SRC_CC)
             + "))"
-            + "((?![$+<=>^`|\uff5c])"
+            + "((?!"
+            + SRC_LINK_SYMBOLS
+            + ")"
             + TPL_HOST_PORT_NO_IP_FUZZY_STRICT
             + _re_src_path(opts)
             + ")"
@@ -1,10 +1,29 @@
+import hashlib
+import json
+import os
+import pickle
 import re
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
-from linkify_it import LinkifyIt, SchemaError
-from linkify_it.main import Match
+from linkify_it import LinkifyIt, SchemaError, main
+from linkify_it.engines import Engine, RegexEngine, get_engine
+from linkify_it.main import Match, PatternCache, SourceCache, _PatternSet, _tlds_re
 from linkify_it.tlds import TLDS
+from linkify_it.ucre import (
+    _ASCII_CLASSES,
+    SRC_ANY,
+    SRC_CC,
+    SRC_P,
+    SRC_Z,
+    TEXT_SEPARATORS,
+    _bmp,
+    ascii_src,
+)
 
 
 def test_pretest_false():
@@ -321,3 +340,876 @@ def test_api_should_not_match_incomplete_links():
 
     assert not linkifyit.match_at_start("http://")
     assert not linkifyit.match_at_start("https://")
+
+
+def test_api_no_pattern_recompile_after_warmup():
+    linkifyit = LinkifyIt()
+    text = "http://google.com //google.com google.com mailto:foo@bar.com foo@bar.com"
+
+    assert linkifyit.pretest(text)
+    assert len(linkifyit.match(text)) == 5
+    assert linkifyit.match_at_start(text)
+    warm = linkifyit.pattern_compiles
+    assert warm > 0
+
+    for _ in range(3):
+        assert linkifyit.pretest(text)
+        assert len(linkifyit.match(text)) == 5
+        assert linkifyit.match_at_start(text)
+
+    assert linkifyit.pattern_compiles == warm
+
+
+def test_api_twitter_rule_match_in_place():
+    linkifyit = LinkifyIt()
+
+    def validate(self, text, pos):
+        if not self.re.get("twitter"):
+            self.re["twitter"] = re.compile(
+                "([a-zA-Z0-9_]){1,15}(?!_)(?=$|" + self.re["src_ZPCc"] + ")"
+            )
+        founds = self.re["twitter"].match(text, pos)
+        if founds:
+            if pos >= 2 and text[pos - 2] == "@":
+                return 0
+            return len(founds.group())
+        return 0
+
+    def normalize(self, m):
+        m.url = "https://twitter.com/" + re.sub(r"^@", "", m.url)
+
+    linkifyit.add("@", {"validate": validate, "normalize": normalize})
+
+    assert linkifyit.match("hello, @gamajoba_!")[0].text == "@gamajoba_"
+    assert linkifyit.match(":@givi")[0].url == "https://twitter.com/givi"
+    assert not linkifyit.test("@@invalid")
+
+
+def test_api_anchored_rule_matches_in_place():
+    linkifyit = LinkifyIt().add("my:", {"validate": re.compile(r"^\/\/[a-z]+")})
+
+    text = "my://asdf " * 3
+    assert linkifyit.test_schema_at(text, "my:", 13) == 6
+    assert linkifyit.test_schema_at(text, "my:", 14) == 0
+
+    # not anchored rules keep searching the whole tail
+    linkifyit = LinkifyIt().add("my:", {"validate": re.compile(r"[a-z]+")})
+
+    assert linkifyit.test_schema_at("my:// asdf", "my:", 3) == 4
+
+
+@pytest.mark.parametrize(
+    "validate,text,expected",
+    [
+        (r"^foo|^bar", "see xy:bar ok", "xy:bar"),
+        (r"^foo|^bar", "see xy:foo ok", "xy:foo"),
+        (r"^(?<=:)x+", "see xy:xx ok", None),
+        (r"^\bxx", "see xy:xx ok", "xy:xx"),
+        (r"^x?^xx", "see xy:xx ok", "xy:xx"),
+        (r"^[|^]+", "see xy:|^ ok", "xy:|^"),
+        (r"^(?:a|x)+", "see xy:xx ok", "xy:xx"),
+    ],
+)
+def test_api_anchored_rule_same_as_tail_search(validate, text, expected):
+    linkifyit = LinkifyIt().add("xy:", {"validate": validate})
+
+    match = linkifyit.match(text)
+
+    assert (match[0].text if match else None) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "http://a.com google.com foo@bar.com mailto:foo@bar.com //x.com",
+        "foo@bar.com//google.com",
+        "a.com:http://b.com",
+        "@@http://google.com",
+        "xhttp://google.com google.com.",
+    ],
+)
+def test_api_match_same_as_test_on_tails(text):
+    linkifyit = LinkifyIt()
+
+    expected = []
+    shift = 0
+    while linkifyit.test(text[shift:]):
+        expected.append(
+            (linkifyit._index + shift, linkifyit._last_index + shift, linkifyit._schema)
+        )
+        shift += linkifyit._last_index
+
+    result = linkifyit.match(text) or []
+
+    assert [(m.index, m.last_index, m.schema) for m in result] == expected
+
+
+def test_api_finditer():
+    linkifyit = LinkifyIt()
+    text = "http://a.com google.com foo@bar.com mailto:foo@bar.com //x.com"
+
+    matches = linkifyit.finditer(text)
+
+    assert not isinstance(matches, list)
+    assert [repr(m) for m in matches] == [repr(m) for m in linkifyit.match(text)]
+    assert list(linkifyit.finditer("no links")) == []
+
+
+def test_api_finditer_stop_early():
+    linkifyit = LinkifyIt()
+    text = "google.com " * 5
+
+    matches = linkifyit.finditer(text)
+    assert next(matches).index == 0
+    assert next(matches).index == 11
+
+    # abandoned iterator doesn't leak into next calls
+    assert len(linkifyit.match(text)) == 5
+    assert [m.index for m in matches] == [22, 33, 44]
+
+
+def test_api_shared_instance_in_threads():
+    linkifyit = LinkifyIt()
+    texts = [
+        "http://a.com google.com foo@bar.com",
+        "no links here",
+        "mailto:foo@bar.com //x.com " * 20,
+        "github.com! " * 50,
+    ]
+    expected = [[repr(m) for m in linkifyit.match(t) or []] for t in texts]
+
+    def run(i):
+        for _ in range(50):
+            idx = (i + _) % len(texts)
+            text = texts[idx]
+            linkifyit.test(text)
+            assert [repr(m) for m in linkifyit.match(text) or []] == expected[idx]
+        return True
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert all(executor.map(run, range(16)))
+
+
+def test_api_first_scan_in_threads():
+    """Threads make the first scans of a new instance at once, while it
+    compiles."""
+    texts = ["git://a.com google.com foo@bar.com", "http://x.org " * 20]
+    expected = [
+        [repr(m) for m in LinkifyIt().add("git:", "http:").match(t)] for t in texts
+    ]
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for i in range(20):
+            # New tlds, so patterns are built, not taken from cache
+            linkifyit = LinkifyIt().add("git:", "http:").tlds(f"zone{i}", True)
+            barrier = threading.Barrier(8)
+
+            def run(i):
+                barrier.wait()
+                text = texts[i % 2]
+                return [repr(m) for m in linkifyit.match(text)] == expected[i % 2]
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                assert all(executor.map(run, range(8)))
+    finally:
+        sys.setswitchinterval(interval)
+
+
+def test_api_scan_cache_does_not_keep_text():
+    linkifyit = LinkifyIt()
+
+    assert not linkifyit.test("no links " * 1000)
+    assert linkifyit._text_cache == ""
+
+    assert linkifyit.test("google.com")
+    assert len(linkifyit.match("google.com")) == 1
+    assert linkifyit._text_cache == ""
+
+
+def test_api_custom_handlers_are_bound_per_instance():
+    def make(n):
+        def validate(self, text, pos):
+            founds = re.compile(r"\/\/[a-z]+").match(text, pos)
+            return len(founds.group()) if founds else 0
+
+        def normalize(self, m):
+            m.url = f"{n}:{m.url}"
+
+        return LinkifyIt().add("my:", {"validate": validate, "normalize": normalize})
+
+    def run(n):
+        linkifyit = make(n)
+        other = make(n + 1000)
+        assert linkifyit.match("my://asdf")[0].url == f"{n}:my://asdf"
+        assert other.match("my://asdf")[0].url == f"{n + 1000}:my://asdf"
+        return True
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert all(executor.map(run, range(64)))
+
+    assert not hasattr(LinkifyIt, "func")
+
+
+def test_api_match_is_compact_and_lazy():
+    calls = []
+
+    def normalize(self, m):
+        calls.append(m.raw)
+        m.url = m.url.upper()
+
+    linkifyit = LinkifyIt().add(
+        "my:", {"validate": r"^\/\/[a-z]+", "normalize": normalize}
+    )
+
+    match = linkifyit.match("google.com. my://asdf!")[1]
+
+    assert not hasattr(match, "__dict__")
+    assert (match.index, match.last_index, match.schema) == (12, 21, "my:")
+    assert calls == []
+
+    assert match.url == "MY://ASDF"
+    assert match.text == "my://asdf"
+    assert calls == ["my://asdf"]
+    assert (
+        repr(match)
+        == "linkify_it.main.Match({'schema': 'my:', 'index': 12, 'last_index': 21, 'raw': 'my://asdf', 'text': 'my://asdf', 'url': 'MY://ASDF'})"  # noqa: E501
+    )
+
+
+def test_api_match_many():
+    linkifyit = LinkifyIt()
+    texts = ["google.com", "", "no links", "http://a.com foo@bar.com", "x.com"]
+
+    result = linkifyit.match_many(texts)
+
+    assert len(result) == len(texts)
+    for text, matches in zip(texts, result):
+        expected = linkifyit.match(text)
+        if expected is None:
+            assert matches is None
+        else:
+            assert [repr(m) for m in matches] == [repr(m) for m in expected]
+
+    assert linkifyit.match_many(iter(texts), only_indexes=True) == [0, 3, 4]
+
+
+def _validate_my(self, text, pos):
+    founds = re.compile(r"\/\/[a-z]+").match(text, pos)
+    return len(founds.group()) if founds else 0
+
+
+def _normalize_my(self, m):
+    m.url = m.url.upper()
+
+
+def test_api_snapshot_pickle():
+    linkifyit = (
+        LinkifyIt(options={"fuzzy_ip": True})
+        .add("my:", {"validate": _validate_my, "normalize": _normalize_my})
+        .add("git:", "http:")
+        .add("ftp:", None)
+        .tlds("onion", True)
+    )
+    text = "my://asdf git://a.com ftp://b.com 1.1.1.1 tamanegi.onion"
+
+    restored = pickle.loads(pickle.dumps(linkifyit))
+
+    assert [repr(m) for m in restored.match(text)] == [
+        repr(m) for m in linkifyit.match(text)
+    ]
+    assert restored.match(text)[0].url == "MY://ASDF"
+
+    match = pickle.loads(pickle.dumps(linkifyit.match(text)[0]))
+    assert repr(match) == repr(linkifyit.match(text)[0])
+
+
+def test_api_snapshot_not_importable_handler():
+    linkifyit = LinkifyIt().add("my:", {"validate": lambda self, text, pos: 0})
+
+    with pytest.raises(SchemaError):
+        linkifyit.snapshot()
+
+
+def test_api_parallel_match():
+    linkifyit = LinkifyIt().add(
+        "my:", {"validate": _validate_my, "normalize": _normalize_my}
+    )
+    texts = ["google.com my://asdf", "no links", "foo@bar.com"] * 10
+
+    result = list(linkifyit.parallel_match(texts, workers=2, chunksize=4))
+
+    assert [[repr(m) for m in r] if r else r for r in result] == [
+        [repr(m) for m in r] if r else r for r in linkifyit.match_many(texts)
+    ]
+
+
+def test_api_pattern_sets_are_shared():
+    first = LinkifyIt()
+    second = LinkifyIt()
+
+    assert first._core.patterns is second._core.patterns
+    assert first.re is not second.re
+
+    second.tlds("onion", True)
+    assert first._core.patterns is not second._core.patterns
+    assert first.test("google.com")
+    assert not first.test("google.onion")
+    assert second.test("google.onion")
+
+    # Instance sources can be changed without affecting others
+    second.re["src_tlds"] = ""
+    assert LinkifyIt().re["src_tlds"] == first.re["src_tlds"]
+
+
+def test_api_pattern_cache_budget():
+    cache = PatternCache(max_bytes=1)
+    builds = []
+
+    def build(name):
+        builds.append(name)
+        return _PatternSet({"src": name * 100})
+
+    first = cache.get("first", lambda: build("a"))
+    assert cache.get("first", lambda: build("b")) is first
+    assert builds == ["a"]
+
+    cache.get("second", lambda: build("c"))
+    assert len(cache) == 1
+    assert cache.get("first", lambda: build("d")) is not first
+    assert builds == ["a", "c", "d"]
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+class CountingLinkifyIt(LinkifyIt):
+    compiles = 0
+
+    def _compile(self):
+        self.compiles += 1
+        super()._compile()
+
+
+def test_api_compile_is_deferred():
+    linkifyit = CountingLinkifyIt()
+    assert linkifyit.compiles == 0
+
+    for i in range(10):
+        linkifyit.add(f"app{i}:", "http:")
+    linkifyit.tlds("onion", True)
+    assert linkifyit.compiles == 0
+
+    assert linkifyit.test("app5://google.onion")
+    assert linkifyit.test("google.onion")
+    assert linkifyit.compiles == 1
+
+    with pytest.raises(SchemaError):
+        linkifyit.add("bad:", [])
+
+
+def test_api_configure():
+    linkifyit = CountingLinkifyIt()
+
+    with linkifyit.configure() as config:
+        config.add("git:", "http:").add("ssh:", "http:")
+        with config.configure():
+            config.tlds("onion", True)
+        assert linkifyit.compiles == 0
+
+    assert linkifyit.compiles == 1
+    assert linkifyit.test("git://google.com")
+    assert linkifyit.test("google.onion")
+    assert linkifyit.compiles == 1
+
+
+def test_api_set_triple_dash_recompiles():
+    linkifyit = LinkifyIt()
+    assert linkifyit.match("http://e.com/foo---bar")[0].text == "http://e.com/foo---bar"
+
+    linkifyit.set({"---": True})
+    assert linkifyit.match("http://e.com/foo---bar")[0].text == "http://e.com/foo"
+    assert linkifyit.match("text@example.com---foo")[0].text == "text@example.com"
+
+    linkifyit.set({"---": False})
+    assert linkifyit.match("http://e.com/foo---bar")[0].text == "http://e.com/foo---bar"
+
+
+def test_api_recompile_only_affected_patterns():
+    linkifyit = CountingLinkifyIt()
+    text = "http://google.com google.com foo@bar.com"
+    assert len(linkifyit.match(text)) == 3
+    patterns = linkifyit._core.patterns.patterns
+
+    # Other options don't touch patterns
+    linkifyit.set({"fuzzy_ip": True})
+    assert len(linkifyit.match(text)) == 3
+    assert linkifyit.compiles == 1
+
+    # Schemas affect only schema search, fuzzy patterns are reused
+    linkifyit.add("incremental:", "http:")
+    assert linkifyit.test("incremental://google.com")
+    # ASCII texts use ASCII variants of patterns
+    changed = linkifyit._core.patterns.patterns
+    assert changed[("link_fuzzy", "ascii")] is patterns[("link_fuzzy", "ascii")]
+    assert changed[("email_fuzzy", "ascii")] is patterns[("email_fuzzy", "ascii")]
+    assert changed[("http", "ascii")] is patterns[("http", "ascii")]
+    assert (
+        changed[("schema_search", "ascii")] is not patterns[("schema_search", "ascii")]
+    )
+
+    # Tlds keep schema handlers and built-in validators
+    compiled = linkifyit._core.compiled
+    linkifyit.tlds("incremental", True)
+    assert linkifyit.test("google.incremental")
+    assert linkifyit._core.compiled is compiled
+    assert (
+        linkifyit._core.patterns.patterns[("http", "ascii")]
+        is patterns[("http", "ascii")]
+    )
+
+
+def test_api_iana_tlds():
+    linkifyit = LinkifyIt().iana_tlds()
+
+    assert linkifyit.test("google.xyz")
+    assert linkifyit.test("google.com")
+    assert linkifyit.test("google.co.uk")
+    assert not linkifyit.test("google.myroot")
+    assert not linkifyit.test("google.comx")
+    assert linkifyit.match("google.coop.")[0].text == "google.coop"
+
+    linkifyit = LinkifyIt().iana_tlds(True)
+    assert linkifyit.test("google.xyz")
+    assert linkifyit.test("google.рф")
+
+
+@pytest.mark.parametrize("tlds", [["com", "co", "coop", "c"], TLDS])
+def test_api_tlds_trie(tlds):
+    src = _tlds_re(tlds)
+    pattern = re.compile("^(?:" + src + ")$", flags=re.IGNORECASE)
+    names = {tld.lower() for tld in tlds}
+
+    assert all(pattern.match(tld) for tld in tlds)
+    for tld in names:
+        assert bool(pattern.match(tld + "x")) == (tld + "x" in names)
+        assert bool(pattern.match(tld[:-1])) == (tld[:-1] in names)
+
+
+def test_api_tlds_trie_keeps_regexp_items():
+    assert _tlds_re(["com", "co", "a[bc]"]) == "com?|a[bc]"
+
+
+def test_api_tld_set():
+    linkifyit = LinkifyIt(options={"tld_set": True})
+    patterns = linkifyit._core.patterns
+
+    assert linkifyit.test("google.com")
+    assert linkifyit.test("google.de")
+    assert not linkifyit.test("google.xyz")
+    assert not linkifyit.test("google.comx")
+    text = "foo@bar.com google.xyz 1.1.1.1 google.xn--p1ai"
+    expected = [repr(m) for m in LinkifyIt().match(text)]
+    assert [repr(m) for m in linkifyit.match(text)] == expected
+
+    # Tlds are checked after match, patterns are kept
+    linkifyit.iana_tlds()
+    assert linkifyit.test("google.xyz")
+    assert not linkifyit.test("google.myroot")
+    assert linkifyit._core.patterns is patterns
+
+    linkifyit.tlds(["myroot", "x[yz]"], True)
+    assert linkifyit.test("google.myroot")
+    assert linkifyit.test("google.xz")
+    assert linkifyit._core.patterns is patterns
+
+
+@pytest.mark.parametrize("scanner", ["regex", "anchor"])
+@pytest.mark.parametrize("dashes", [False, True])
+@pytest.mark.parametrize(
+    "text",
+    [
+        "GOOGLE.COM---$1.2.3.4",
+        "b.ru----1.2.3.4",
+        "x a@b.ru---c.d---e.zz",
+        "x.com---google.ru",
+        "google.\u017fhop",
+        "google.\u0130t",
+        "foo@google.\u017fhop",
+    ],
+)
+def test_api_tld_set_same_links(text, dashes, scanner):
+    """Links found with ``tld_set`` are the same as with tlds in patterns."""
+    options = {"---": dashes, "scanner": scanner}
+    expected = [repr(m) for m in LinkifyIt(options=options).match(text) or []]
+    linkifyit = LinkifyIt(options={**options, "tld_set": True})
+
+    assert [repr(m) for m in linkifyit.match(text) or []] == expected
+
+
+def test_api_prefilter():
+    linkifyit = LinkifyIt()
+
+    assert not linkifyit.pretest("no links here, only words")
+    assert not linkifyit.test("no links here, only words")
+    assert linkifyit.pretest("LOCALHOST")
+    assert linkifyit.test("http://LOCALHOST:8080")
+
+    # Schema names ending with a letter are found in any case
+    linkifyit.add("sKypE", "http:").add("wiki", "http:")
+    assert linkifyit.pretest("SKYPE//google")
+    assert linkifyit.pretest("wİKI//google")
+    assert linkifyit.pretest("wıkı//google")
+    assert not linkifyit.pretest("skip wik")
+
+
+class HookedLinkifyIt(LinkifyIt):
+    def _on_compile(self):
+        self.re["tpl_host_fuzzy_test"] = "host"
+
+
+def test_api_prefilter_off_with_hook():
+    linkifyit = HookedLinkifyIt()
+
+    assert linkifyit._core.triggers is None
+    assert linkifyit.pretest("myhost")
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "google.com|example.org $www.test.com x.y",
+        'foo "bar"@baz.com, a"b@c.com and (x@y.com)',
+        "wİKI//google.com sKYPE//foo.com http://x.com/a.b.c mailto:a@b.com",
+        "1.1.1.1 localhost:80 //google.com ftp://a.b " + "x" * 100 + ".com",
+        "http://e.com/foo---bar text@example.com---foo",
+    ],
+)
+def test_api_anchor_scanner(text):
+    regex = LinkifyIt(options={"fuzzy_ip": True})
+    anchor = LinkifyIt(options={"fuzzy_ip": True, "scanner": "anchor"})
+    for linkifyit in (regex, anchor):
+        linkifyit.add("sKypE", "http:").add("wiki", "http:")
+
+    assert anchor.test(text) == regex.test(text)
+    assert [repr(m) for m in anchor.match(text)] == [repr(m) for m in regex.match(text)]
+    assert [repr(m) for m in anchor.finditer(text[5:])] == [
+        repr(m) for m in regex.finditer(text[5:])
+    ]
+
+
+def test_api_scanner_unknown():
+    with pytest.raises(ValueError):
+        LinkifyIt(options={"scanner": "bogus"})
+
+    linkifyit = LinkifyIt()
+    with pytest.raises(ValueError):
+        linkifyit.set({"scanner": "bogus"})
+    assert linkifyit.test("google.com")
+
+
+def test_api_anchor_scanner_with_hook():
+    linkifyit = HookedLinkifyIt(options={"scanner": "anchor"})
+
+    assert linkifyit._core.anchors() is None
+    assert linkifyit.match("myhost google.com")[0].text == "google.com"
+    assert not linkifyit.test("google.com")
+
+
+class ValidatorHookedLinkifyIt(LinkifyIt):
+    def _on_compile(self):
+        # Form of validator sources before they were matched in place
+        self.re["mailto"] = (
+            "^" + self.re["src_email_name"] + "@" + self.re["src_host_strict"]
+        )
+        self.re["http"] = (
+            "^\\/\\/"
+            + self.re["src_auth"]
+            + self.re["src_host_port_strict"]
+            + self.re["src_path"]
+        )
+
+
+def test_api_validator_hook_with_caret():
+    linkifyit = ValidatorHookedLinkifyIt()
+
+    assert linkifyit.test_schema_at("mailto:foo@bar.com", "mailto:", 7) == 11
+    assert linkifyit.test_schema_at("see http://bar.com", "http:", 9) == 9
+    assert linkifyit.match("see http://bar.com")[0].url == "http://bar.com"
+
+
+@pytest.mark.parametrize(
+    "name,src",
+    [
+        ("src_ZPCc", "|".join([SRC_Z, SRC_P, SRC_CC])),
+        ("src_ZCc", "|".join([SRC_Z, SRC_CC])),
+        (
+            "src_pseudo_letter",
+            "(?:(?!"
+            + TEXT_SEPARATORS
+            + "|"
+            + SRC_Z
+            + "|"
+            + SRC_P
+            + "|"
+            + SRC_CC
+            + ")"
+            + SRC_ANY
+            + ")",
+        ),
+    ],
+)
+def test_api_merged_unicode_classes(name, src):
+    linkifyit = LinkifyIt()
+    merged = re.compile(linkifyit.re[name], flags=re.IGNORECASE)
+    chars = _bmp() + "\U0001f600\U0001d7d8"
+
+    assert merged.pattern.startswith("(?-i:[")
+    assert merged.findall(chars) == re.findall(src, chars, flags=re.IGNORECASE)
+
+
+def test_api_ascii_classes():
+    linkifyit = LinkifyIt()
+    assert linkifyit.test("google.com")
+    chars = "".join(map(chr, range(0x80)))
+
+    assert _ASCII_CLASSES
+    for unicode_class, ascii_class in _ASCII_CLASSES.items():
+        assert ascii_src("x" + unicode_class + "*") == "x" + ascii_class + "*"
+        assert re.findall(ascii_class, chars, flags=re.I | re.A) == re.findall(
+            unicode_class, chars, flags=re.I
+        )
+
+
+def test_api_ascii_patterns():
+    # Own tlds, to not share patterns compiled by other tests
+    linkifyit = LinkifyIt().tlds(["com", "рф", "asciitest"])
+    patterns = linkifyit._core.patterns.patterns
+
+    assert linkifyit.match("google.com")[0].text == "google.com"
+    assert ("link_no_ip_fuzzy", "ascii") in patterns
+    assert "link_no_ip_fuzzy" not in patterns
+
+    assert linkifyit.match("пример.рф google.com")[0].text == "пример.рф"
+    assert "link_no_ip_fuzzy" in patterns
+
+
+class CountingEngine(Engine):
+    name = "counting"
+
+    def __init__(self):
+        super().__init__()
+        self.compiles = 0
+
+    def compile(self, src, ascii=False):
+        self.compiles += 1
+        return super().compile(src, ascii)
+
+
+def test_api_engine_default():
+    linkifyit = LinkifyIt()
+
+    assert linkifyit.engine is get_engine()
+    assert linkifyit.engine.name == "re"
+    assert isinstance(linkifyit.engine.compile("a"), re.Pattern)
+
+
+def test_api_engine_custom():
+    engine = CountingEngine()
+    linkifyit = LinkifyIt(options={"engine": engine})
+    text = "http://google.com google.com foo@bar.com"
+    sources = linkifyit.re
+
+    assert linkifyit.engine is engine
+    assert len(linkifyit.match(text)) == 3
+    assert engine.compiles == linkifyit.pattern_compiles > 0
+
+    # Sources are reused, patterns are compiled by new engine
+    linkifyit.set({"engine": "re"})
+    assert linkifyit.engine.name == "re"
+    assert linkifyit.re == sources
+    assert len(linkifyit.match(text)) == 3
+
+
+def test_api_engine_custom_pickle():
+    engine = CountingEngine()
+    linkifyit = LinkifyIt(options={"engine": engine})
+    text = "http://google.com google.com foo@bar.com"
+
+    restored = pickle.loads(pickle.dumps(linkifyit))
+
+    assert isinstance(restored.engine, CountingEngine)
+    assert [repr(m) for m in restored.match(text)] == [
+        repr(m) for m in linkifyit.match(text)
+    ]
+    assert restored.engine.compiles > 0
+
+    result = list(linkifyit.parallel_match([text] * 4, workers=2))
+    assert [[repr(m) for m in r] for r in result] == [
+        [repr(m) for m in linkifyit.match(text)]
+    ] * 4
+
+
+def test_api_engine_unknown():
+    with pytest.raises(ValueError):
+        LinkifyIt(options={"engine": "pcre"})
+
+    linkifyit = LinkifyIt()
+    with pytest.raises(ValueError):
+        linkifyit.set({"engine": "pcre"})
+    assert linkifyit.test("google.com")
+
+
+def test_api_engine_detection(monkeypatch):
+    assert Engine.available()
+
+    monkeypatch.setattr(RegexEngine, "module", "linkify_it_no_such_module")
+    assert not RegexEngine.available()
+
+
+def test_api_engine_fallback(monkeypatch):
+    monkeypatch.setattr(RegexEngine, "module", "linkify_it_no_such_module")
+    linkifyit = LinkifyIt(options={"engine": "regex"})
+
+    assert get_engine("regex").name == "re"
+    assert linkifyit.engine.name == "re"
+    assert linkifyit.match("google.com")[0].url == "http://google.com"
+
+
+def test_api_engine_regex():
+    pytest.importorskip("regex")
+    linkifyit = LinkifyIt(options={"engine": "regex"})
+
+    assert linkifyit.engine.name == "regex"
+    assert linkifyit._core.patterns.engine is linkifyit.engine
+    # Same links as with `re`, see `test_engine_regex` in test_linkify.py
+    assert linkifyit.test("google.com")
+
+
+@pytest.fixture
+def source_cache(tmp_path, monkeypatch):
+    cache = SourceCache(str(tmp_path / "cache"))
+    monkeypatch.setattr(main, "SOURCE_CACHE", cache)
+    # Patterns are not in memory, as in a new process
+    main.PATTERN_CACHE.clear()
+    return cache
+
+
+def source_config(linkifyit):
+    key = linkifyit._core.patterns.key
+    return {part: key[part] for part in ("options", "tlds", "schemas")}
+
+
+def test_api_source_cache(source_cache, monkeypatch):
+    linkifyit = LinkifyIt().tlds(["com", "diskcache"])
+    assert linkifyit.test("google.diskcache")
+    assert (source_cache.hits, source_cache.misses) == (0, 1)
+    assert len(os.listdir(source_cache.directory)) == 1
+
+    # New process: sources are loaded from disk, not built
+    main.PATTERN_CACHE.clear()
+    monkeypatch.setattr(LinkifyIt, "_build_patterns", None)
+    loaded = LinkifyIt().tlds(["com", "diskcache"])
+
+    assert loaded.re == linkifyit.re
+    assert loaded.match("google.diskcache")[0].url == "http://google.diskcache"
+    assert loaded.match("пример.diskcache")[0].url == "http://пример.diskcache"
+    assert (source_cache.hits, source_cache.misses) == (1, 1)
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "{broken",
+        '{"meta": {}, "checksum": "", "re": {}, "ascii_classes": {}}',
+        "[]",
+        "",
+    ],
+)
+def test_api_source_cache_rebuilds_broken(source_cache, content):
+    linkifyit = LinkifyIt().tlds(["com", "diskbroken"])
+    assert linkifyit.test("google.diskbroken")
+    config = source_config(linkifyit)
+    with open(source_cache.path(config), "w", encoding="utf-8") as f:
+        f.write(content)
+
+    main.PATTERN_CACHE.clear()
+    rebuilt = LinkifyIt().tlds(["com", "diskbroken"])
+
+    assert rebuilt.test("google.diskbroken")
+    assert rebuilt.re == linkifyit.re
+    assert source_cache.misses == 2
+    # Entry is rewritten
+    assert source_cache.load(config) == linkifyit.re
+
+
+@pytest.mark.parametrize(
+    "body", [b"[]", b'{"re": {"x": 1}, "ascii_classes": {}}', b"\x80"]
+)
+def test_api_source_cache_rejects_bad_body(source_cache, body):
+    linkifyit = LinkifyIt().tlds(["com", "diskbody"])
+    assert linkifyit.test("google.diskbody")
+    config = source_config(linkifyit)
+    path = source_cache.path(config)
+
+    # Sources are plain JSON, not code
+    with open(path, "rb") as f:
+        header, saved = f.read().split(b"\n", 1)
+    assert json.loads(saved)["re"] == linkifyit.re
+
+    # Body with valid checksum, but not sources
+    header = json.loads(header)
+    header["checksum"] = hashlib.sha256(body).hexdigest()
+    with open(path, "wb") as f:
+        f.write(json.dumps(header).encode("utf-8") + b"\n" + body)
+
+    assert source_cache.load(config) is None
+
+
+def test_api_source_cache_stale(source_cache, monkeypatch):
+    config = {"options": False, "tlds": None, "schemas": "x:"}
+    source_cache.save(config, {"pretest": "x:"})
+    assert source_cache.load(config) == {"pretest": "x:"}
+
+    # Changed sources
+    with open(source_cache.path(config), "rb") as f:
+        content = f.read()
+    with open(source_cache.path(config), "wb") as f:
+        f.write(b"y:".join(content.rsplit(b"x:", 1)))
+    assert source_cache.load(config) is None
+
+    # Other library version
+    source_cache.save(config, {"pretest": "x:"})
+    monkeypatch.setattr("linkify_it.__version__", "0.0.0")
+    assert source_cache.load(config) is None
+
+    source_cache.clear()
+    assert not os.listdir(source_cache.directory)
+
+
+def test_api_source_cache_off(source_cache):
+    source_cache.directory = None
+    LinkifyIt().tlds(["com", "diskoff"]).test("google.diskoff")
+
+    assert (source_cache.hits, source_cache.misses) == (0, 0)
+
+
+def test_api_source_cache_skips_hooked(source_cache):
+    HookedLinkifyIt().tlds(["com", "diskhooked"]).test("google.diskhooked")
+
+    assert (source_cache.hits, source_cache.misses) == (0, 0)
+
+
+def test_api_import_is_lazy():
+    code = (
+        "import sys, linkify_it; linkify_it.LinkifyIt(); "
+        "print(' '.join(sorted(sys.modules)))"
+    )
+    modules = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.split()
+
+    assert "linkify_it.main" in modules
+    assert "linkify_it.tlds" not in modules
+    assert "uc_micro" not in modules
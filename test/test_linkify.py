@@ -17,8 +17,18 @@ def dummy(_):
     "number,line,expected",
     read_fixture_file(FIXTURE_PATH.joinpath("links.txt")),
 )
-def test_links(number, line, expected):
-    linkifyit = LinkifyIt(options={"fuzzy_ip": True})
+@pytest.mark.parametrize("dashes", [False, True])
+@pytest.mark.parametrize("tld_set", [False, True])
+@pytest.mark.parametrize("scanner", ["regex", "anchor"])
+def test_links(number, line, expected, tld_set, scanner, dashes):
+    linkifyit = LinkifyIt(
+        options={
+            "fuzzy_ip": True,
+            "tld_set": tld_set,
+            "scanner": scanner,
+            "---": dashes,
+        }
+    )
 
     linkifyit.normalize = dummy
 
@@ -26,15 +36,94 @@ def test_links(number, line, expected):
     assert linkifyit.test("\n" + line + "\n") is True
     assert linkifyit.test(line) is True
     assert linkifyit.match(line)[0].url == expected
+    assert next(linkifyit.finditer(line)).url == expected
 
 
 @pytest.mark.parametrize(
     "number,line,expected",
     read_fixture_file(FIXTURE_PATH.joinpath("not_links.txt")),
 )
-def test_not_links(number, line, expected):
-    linkifyit = LinkifyIt()
+@pytest.mark.parametrize("dashes", [False, True])
+@pytest.mark.parametrize("tld_set", [False, True])
+@pytest.mark.parametrize("scanner", ["regex", "anchor"])
+def test_not_links(number, line, expected, tld_set, scanner, dashes):
+    linkifyit = LinkifyIt(
+        options={"tld_set": tld_set, "scanner": scanner, "---": dashes}
+    )
 
     linkifyit.normalize = dummy
 
     assert linkifyit.test(line) is False
+
+
+@pytest.mark.parametrize(
+    "number,line,expected",
+    read_fixture_file(FIXTURE_PATH.joinpath("links.txt"))
+    + read_fixture_file(FIXTURE_PATH.joinpath("not_links.txt")),
+)
+@pytest.mark.parametrize("options", [{"fuzzy_ip": True}, {"---": True}])
+def test_ascii_patterns(number, line, expected, options):
+    linkifyit = LinkifyIt(options=options)
+    core = linkifyit._core
+
+    for text in (line, line.encode("ascii", "replace").decode("ascii")):
+        if not text.isascii():
+            continue
+        for name in linkifyit.re:
+            if name.startswith(("src_", "tpl_")):
+                continue
+            full = [m.span() for m in core.pattern(name).finditer(text)]
+            ascii = [m.span() for m in core.pattern(name, True).finditer(text)]
+            assert ascii == full, name
+
+
+# Letters with special case folding, and an astral one
+LETTERS = (
+    "\u00df\u1e9e\u00e9\u0130\u0131\u017f\u212a\u03a3\u03c2\u00b5\u01c5\u2126\U00010400"
+)
+
+
+@pytest.mark.parametrize(
+    "number,line,expected",
+    read_fixture_file(FIXTURE_PATH.joinpath("links.txt"))
+    + read_fixture_file(FIXTURE_PATH.joinpath("not_links.txt")),
+)
+@pytest.mark.parametrize("options", [{"fuzzy_ip": True}, {"---": True}])
+def test_engine_regex(number, line, expected, options):
+    pytest.importorskip("regex")
+    default = LinkifyIt(options=options)
+    linkifyit = LinkifyIt(options={**options, "engine": "regex"})
+
+    texts = [line]
+    for letter in LETTERS:
+        texts.append(line + letter)
+        texts.append(letter + line)
+        texts.append(line.replace(".", letter + ".", 1))
+        texts.append(line.replace("/", "/" + letter, 1))
+        texts.append(line.replace("i", letter))
+
+    for text in texts:
+        expected = [repr(m) for m in default.match(text) or []]
+        assert [repr(m) for m in linkifyit.match(text) or []] == expected, text
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "a.bı",
+        "www.Kı",
+        "foo.İnfo",
+        "xn--p1aiı.com",
+        "maıLto:a@b.com",
+        "ıı@b.com",
+        "http://a.com/..ı",
+    ],
+)
+def test_engine_regex_i_variants(text):
+    pytest.importorskip("regex")
+    default = LinkifyIt()
+    linkifyit = LinkifyIt(options={"engine": "regex"})
+
+    expected = [repr(m) for m in default.match(text) or []]
+    assert expected
+    assert [repr(m) for m in linkifyit.match(text) or []] == expected